@@ -11,9 +11,9 @@ from typing import Tuple, List
 
 import dyne.org.funtoo.metatools.pkgtools as pkgtools
 from subpop.util import load_plugin
-from yaml import safe_load
 
 import metatools.cmd
+from metatools.yaml_util import safe_load
 
 """
 The `PENDING_QUE` will be built up to contain a full list of all the catpkgs we want to autogen in the full run
@@ -26,11 +26,33 @@ work for all catpkgs in that generator, and wait for completion of this work bef
 
 PENDING_QUE = []
 GENNED_BREEZYBUILDS = {}
-GENNED_BREEZYBUILDS_LOCK = threading.Lock()
+
+"""
+`GENNED_BREEZYBUILDS_LOCKS` guard the check-and-record of an output package directory in `GENNED_BREEZYBUILDS`.
+Rather than one lock serializing every BreezyBuild, the locks are sharded by output package directory, so only pushes
+for directories in the same shard wait on one another. See `genned_breezybuilds_lock`.
+"""
+
+GENNED_BREEZYBUILDS_LOCKS = tuple(threading.Lock() for _ in range(16))
+
+
+def genned_breezybuilds_lock(output_pkgdir):
+	return GENNED_BREEZYBUILDS_LOCKS[hash(output_pkgdir) % len(GENNED_BREEZYBUILDS_LOCKS)]
+
 
 SUB_FP_MAP_LOCK = asyncio.Lock()
 SUB_FP_MAP = {}
 
+"""
+`GENERATOR_SUBS` caches loaded generator plugins by path. Popular generators in kit-fixups/generators are
+referenced by many autogen.yaml rules, and without this cache each rule would re-read, re-compile and re-execute
+the same generator module. Since one module is shared by all the rules (and threads) using it, only things that
+are the same for every user of the module are injected into it, when it is loaded. See `load_generator_sub`.
+"""
+
+GENERATOR_SUBS = {}
+GENERATOR_SUBS_LOCK = threading.Lock()
+
 """
 While it is possible for a `generate()` function to call the `generate()` method on a `BreezyBuild` directly,
 in nearly all cases the `BreezyBuild`'s `push` method is called to queue it for processing. When `push` is
@@ -246,6 +268,23 @@ def init_pkginfo_for_package(pkginfo, sub_path, template_path=None, gen_path=Non
 	return pkginfo
 
 
+def load_generator_sub(sub_path, generator_sub_name):
+	"""
+	Return the generator plugin at ``sub_path``, loading it with ``load_plugin`` (and doing hub injection) only the
+	first time it is requested.
+	"""
+	with GENERATOR_SUBS_LOCK:
+		generator_sub = GENERATOR_SUBS.get(sub_path)
+		if generator_sub is None:
+			generator_sub = load_plugin(sub_path, generator_sub_name)
+			# Do hub injection:
+			generator_sub.hub = hub
+			generator_sub.sub_path = sub_path
+			generator_sub.FOO = "bar"
+			GENERATOR_SUBS[sub_path] = generator_sub
+	return generator_sub
+
+
 async def execute_generator(
 		generator_sub_path=None,
 		generator_sub_name="autogen",
@@ -266,11 +305,7 @@ async def execute_generator(
 	if not generator_sub_path:
 		raise TypeError("generator_sub_path not set to a path.")
 	sub_path = f"{generator_sub_path}/{generator_sub_name}.py"
-	generator_sub = load_plugin(sub_path, generator_sub_name)
-	# Do hub injection:
-	generator_sub.hub = hub
-	generator_sub.sub_path = sub_path
-	generator_sub.FOO = "bar"
+	generator_sub = load_generator_sub(sub_path, generator_sub_name)
 
 	global_defaults = getattr(generator_sub, "GLOBAL_DEFAULTS", {})
 
@@ -484,7 +519,7 @@ def parse_yaml_rule(package_section=None):
 
 		# Remove extra singleton outer dictionary (see format above)
 
-		package_name = list(package_section.keys())[0]
+		package_name = next(iter(package_section))
 		pkg_section = list(package_section.values())[0]
 		pkg_section["name"] = package_name
 
@@ -544,7 +579,7 @@ def queue_all_yaml_autogens(files=None):
 		else:
 			cat = None
 
-		with open(file, "r") as myf:
+		with open(file, "rb") as myf:
 			for rule_name, rule in safe_load(myf.read()).items():
 				if rule is None:
 					raise pkgtools.ebuild.BreezyError(f"Malformed rule '{rule_name}' in {file}")
@@ -590,7 +590,7 @@ class BreezyBuild:
 		#
 		# https://stackoverflow.com/questions/1408171/thread-local-storage-in-python
 
-		with pkgtools.autogen.GENNED_BREEZYBUILDS_LOCK:
+		with pkgtools.autogen.genned_breezybuilds_lock(self.output_pkgdir):
 			if self.output_pkgdir in pkgtools.autogen.GENNED_BREEZYBUILDS and pkgtools.autogen.GENNED_BREEZYBUILDS[self.output_pkgdir] != self.autogen_id:
 				raise BreezyError(f"{self.output_pkgdir} has already been generated by another autogen: {pkgtools.autogen.GENNED_BREEZYBUILDS[self.output_pkgdir]}.")
 			else:
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 import asyncio
-import re
+import copy
+import threading
+from collections import OrderedDict
 from datetime import timedelta, datetime
+from email.message import Message
 
 from metatools.fastpull.spider import FetchError, FetchRequest, ContentNotModified
 from metatools.fetch_cache import CacheMiss
@@ -114,6 +117,47 @@ def set_basic_auth(request: FetchRequest):
 			request.set_auth(**auth_info)
 
 
+# In-process copy of fetch cache entries we have read or written during this run, indexed by the fetch cache key. This
+# allows repeated get_page() calls for the same resource (common for GitHub API endpoints shared by several autogens)
+# to skip the fetch cache store entirely. It is a bounded LRU so a long run doesn't hold every page it has ever seen
+# in memory. Entries are copied going in and coming out, so callers that modify a returned (JSON) body can't affect
+# what other callers get:
+HOT_CACHE = OrderedDict()
+HOT_CACHE_SIZE = 256
+HOT_CACHE_LOCK = threading.Lock()
+
+
+def get_page_key_dict(url, encoding=None, is_json=False):
+	key_dict = {"method_name": "get_page", "url": url, "is_json": is_json}
+	if encoding:
+		key_dict["encoding"] = encoding
+	return key_dict
+
+
+def hot_cache_key(key_dict):
+	return key_dict["url"], key_dict["is_json"], key_dict.get("encoding")
+
+
+def hot_cache_get(key_dict):
+	key = hot_cache_key(key_dict)
+	with HOT_CACHE_LOCK:
+		entry = HOT_CACHE.get(key)
+		if entry is None:
+			return None
+		HOT_CACHE.move_to_end(key)
+	return copy.deepcopy(entry)
+
+
+def hot_cache_put(key_dict, entry):
+	key = hot_cache_key(key_dict)
+	entry = copy.deepcopy(entry)
+	with HOT_CACHE_LOCK:
+		HOT_CACHE[key] = entry
+		HOT_CACHE.move_to_end(key)
+		while len(HOT_CACHE) > HOT_CACHE_SIZE:
+			HOT_CACHE.popitem(last=False)
+
+
 async def really_get_page(url, encoding=None, is_json=False, cached_result=None):
 	"""
 	The purpose of this method is to REALLY attempt to fetch the page -- but also use our cached result to properly
@@ -149,13 +193,7 @@ async def really_get_page(url, encoding=None, is_json=False, cached_result=None)
 				result = cached_result["body"]
 				headers = cached_result["headers"] if "headers" in cached_result else {}
 
-			key_dict = {
-				"method_name": "get_page",
-				"url": url,
-				"is_json": is_json
-			}
-			if encoding:
-				key_dict["encoding"] = encoding
+			key_dict = get_page_key_dict(url, encoding=encoding, is_json=is_json)
 
 			# We will store ETag or Last-Modified headers from the response:
 
@@ -166,6 +204,7 @@ async def really_get_page(url, encoding=None, is_json=False, cached_result=None)
 			if out_headers:
 				key_dict["headers"] = out_headers
 			await pkgtools.model.fetch_cache.write(key_dict=key_dict, body=result)
+			hot_cache_put(key_dict, {"fetched_on": datetime.utcnow(), "body": result, "headers": out_headers})
 			return result
 
 		except FetchError as e:
@@ -199,17 +238,20 @@ async def get_page(fetchable, encoding=None, refresh_interval=None, is_json=Fals
 		url = fetchable
 
 	if refresh_interval is None:
-		refresh_interval = pkgtools.model.fetch_cache_interval
+		# Use the same defaults as fetch_harness(), so we never compare against a refresh_interval of None:
+		if pkgtools.model.fetch_cache_interval is not None:
+			refresh_interval = pkgtools.model.fetch_cache_interval
+		else:
+			refresh_interval = timedelta(minutes=15)
 
-	try:
-		key_dict = {"method_name": "get_page", "url": url, "is_json": is_json}
-		if encoding:
-			key_dict["encoding"] = encoding
-		cached_result = await pkgtools.model.fetch_cache.read(
-			key_dict=key_dict
-		)
-	except CacheMiss:
-		cached_result = None
+	key_dict = get_page_key_dict(url, encoding=encoding, is_json=is_json)
+	cached_result = hot_cache_get(key_dict)
+	if cached_result is None:
+		try:
+			cached_result = await pkgtools.model.fetch_cache.read(key_dict=key_dict)
+			hot_cache_put(key_dict, cached_result)
+		except CacheMiss:
+			cached_result = None
 
 	if cached_result and not pkgtools.model.immediate:
 
@@ -240,8 +282,14 @@ async def get_response_filename(fetchable, refresh_interval=None):
 	if isinstance(fetchable, pkgtools.ebuild.Artifact):
 		fetchable = fetchable.url
 	headers = await get_response_headers(fetchable,refresh_interval=refresh_interval)
-	res = re.search(r"filename=\"?(\S+)\"?", headers.get("Content-Disposition", ""))
-	return None if not res else res.group(1)
+	content_disposition = headers.get("Content-Disposition")
+	if not content_disposition:
+		return None
+	# Let the email package parse the header, so quoted filenames containing spaces and RFC 2231/5987 encoded
+	# (filename*=UTF-8''...) values are handled properly:
+	msg = Message()
+	msg["Content-Disposition"] = content_disposition
+	return msg.get_filename()
 
 
 async def get_url_from_redirect(fetchable, refresh_interval=None):
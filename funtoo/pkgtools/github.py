@@ -146,10 +146,12 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
     # By default, we should sort our releases by version, and start with the most recent version. This is important for some GitHub
     # repos that have multiple 'channels' so the releases may vary and most recent by date may not be what we want.
 
-    if sort == SortMethod.VERSION:
+    # When looking for a specific version, all candidates share that version and a (stable) sort would not change their
+    # order, so we can skip parsing versions entirely:
+
+    if sort == SortMethod.VERSION and version is None and len(versions_and_release_elements) > 1:
         # Have most recent by version at the beginning:
-        versions_and_release_elements = sorted(versions_and_release_elements, key=lambda v: matcher.sortable(v[0]),
-                                               reverse=True)
+        versions_and_release_elements.sort(key=lambda v: matcher.sortable(v[0]), reverse=True)
 
     # Iterate, starting with most recent version. We will break from this loop if we are successful. Otherwise, we will
     # keep trying the second-most-recent version, etc. This helps us deal with situations where not all assets are available
@@ -158,12 +160,9 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
         try:
             if not len(versions_and_release_elements):
                 raise IndexError("No more GitHub releases available.")
-            upstream_assets_by_name = {}
             version, release = versions_and_release_elements[0]
             versions_and_release_elements = versions_and_release_elements[1:]
             tag_name = release['tag_name']
-            for asset in release['assets']:
-                upstream_assets_by_name[asset['name']] = asset
 
             if tarball or assets:
 
@@ -180,6 +179,11 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
                 artifacts = []
                 crates_dict = {}
 
+                # Index upstream assets by name and build our string expansion arguments once per release, so each
+                # requested asset is a single format() plus a dict lookup:
+                upstream_assets_by_name = {asset['name']: asset for asset in release['assets']}
+                format_args = dict(version=version, github_user=github_user, github_repo=github_repo, tag=tag_name, **kwargs)
+
                 if isinstance(assets, dict):
                     artifacts = defaultdict(list)
                     for asset_key, asset_filenames in assets.items():
@@ -187,7 +191,7 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
                             asset_filenames = [asset_filenames] # handle bare string
                         for asset_filename in asset_filenames:
                             # expand {version}, etc.
-                            expanded_asset = asset_filename.format(version=version, key=asset_key, github_user=github_user, github_repo=github_repo,tag=tag_name, **kwargs)
+                            expanded_asset = asset_filename.format(key=asset_key, **format_args)
                             if expanded_asset in upstream_assets_by_name:
                                 upstream_asset = upstream_assets_by_name[expanded_asset]
                                 artifact = hub.Artifact(url=upstream_asset['browser_download_url'], final_name=expanded_asset)
@@ -204,7 +208,7 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
                 elif isinstance(assets, list):
                     # assets is list:
                     for asset_filename in assets:
-                        expanded_asset = asset_filename.format(version=version, github_user=github_user, github_repo=github_repo, tag=tag_name, **kwargs)
+                        expanded_asset = asset_filename.format(**format_args)
                         if expanded_asset in upstream_assets_by_name:
                             upstream_asset = upstream_assets_by_name[expanded_asset]
                             artifact = hub.Artifact(url=upstream_asset['browser_download_url'], final_name=expanded_asset)
@@ -235,7 +239,10 @@ async def release_gen(hub, github_user, github_repo, release_data=None, tarball=
 
             else:
 
-                # We want to grab the default tarball for the associated tag:
+                # We want to grab the default tarball for the associated tag. Note that we look up the ref of the
+                # selected tag rather than prefetching the /tags list alongside the release data: the ref gives us
+                # the SHA1 of the tag object itself (which differs from the commit SHA1 for annotated tags), and it
+                # is the SHA1 that ends up in the artifact's final name, so it must not change.
 
                 desired_tag = tag_name
                 hub.pkgtools.model.log.debug(f"github:release_gen: selected release version: {version}, desired tag {desired_tag}")
@@ -300,6 +307,10 @@ async def latest_tag_version(hub, github_user, github_repo, tag_data=None, trans
     versions_and_tag_elements = []
     async for v_tagel in iter_tag_versions(tag_data, select=select, filter=filter, matcher=matcher, transform=transform,
                                            version=version):
+        if version is not None:
+            # All matches share the same version, so the first one is what max() would pick anyway. Returning it now
+            # avoids scanning (and fetching) the remaining pages of tags:
+            return v_tagel
         versions_and_tag_elements.append(v_tagel)
     if not len(versions_and_tag_elements):
         return
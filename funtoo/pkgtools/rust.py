@@ -1,10 +1,10 @@
 import glob
 import os
-import subprocess
-import toml
 import asyncio
 import hashlib
 import shutil
+import tarfile
+import time
 import urllib
 from collections import defaultdict
 
@@ -12,6 +12,16 @@ from subpop.util import AttrDict
 
 from metatools.cmd import run_shell
 
+# Prefer the tomllib parser (stdlib as of python 3.11, or tomli on older pythons) which is much faster than the toml
+# module for large Cargo.lock files. Fall back to toml if neither is available:
+try:
+	import tomllib
+except ImportError:
+	try:
+		import tomli as tomllib
+	except ImportError:
+		tomllib = None
+
 # TODO: although this is currently working, it's not recommended.
 #       we should look into using non-dyne references to these classes more.
 # from funtoo.pkgtools.ebuild import Artifact, Archive
@@ -73,9 +83,7 @@ async def add_crates_bundle(
 
 		src_dir = glob.glob(os.path.join(src_artifact.extract_path, src_dir_glob))[0]
 
-		cargo_lock_path = os.path.join(src_dir, "Cargo.lock")
-		if not os.path.exists(cargo_lock_path):
-			cargo_cmd = subprocess.Popen(["cargo", "update"], cwd=src_dir).wait()
+		cargo_lock_path = await ensure_cargo_lock(src_artifact, src_dir)
 
 		crates, pkginfo["crates_bundle"].crates_artifacts = await generate_crates_metadata(
 			lock_path=cargo_lock_path
@@ -121,6 +129,45 @@ async def add_crates_bundle(
 		)
 
 
+def write_crates_tarball(tarball_path, top_directory, crates_artifacts):
+	"""
+	Write a ``.tar.gz`` bundle at ``tarball_path`` containing the (already fetched) ``crates_artifacts``, streamed
+	directly from the BLOS into the bundle under ``./top_directory/``. This avoids staging a copy of every crate on disk
+	just so ``tar`` can read it back again.
+	"""
+	os.makedirs(os.path.dirname(tarball_path), exist_ok=True)
+	with tarfile.open(tarball_path, mode="w:gz") as tar:
+		top_info = tarfile.TarInfo(f"./{top_directory}")
+		top_info.type = tarfile.DIRTYPE
+		top_info.mode = 0o755
+		top_info.mtime = int(time.time())
+		tar.addfile(top_info)
+		for artifact in crates_artifacts:
+			tar.add(artifact.blos_object.blob.path, arcname=f"./{top_directory}/{artifact.final_name}")
+
+
+async def ensure_cargo_lock(src_artifact, src_dir):
+	"""
+	Return the path to the "Cargo.lock" in ``src_dir``, which contains the extracted ``src_artifact``. If the artifact
+	doesn't ship a "Cargo.lock", one is generated using ``cargo update``. As this involves a slow network resolve, the
+	generated "Cargo.lock" is cached (indexed by the artifact's digest and the source directory within it) so this only
+	needs to happen once per source artifact.
+	"""
+	cargo_lock_path = os.path.join(src_dir, "Cargo.lock")
+	if os.path.exists(cargo_lock_path):
+		return cargo_lock_path
+	rel_src_dir = os.path.relpath(src_dir, src_artifact.extract_path)
+	cache_key = hashlib.sha512(f"{src_artifact.hash('sha512')}:{rel_src_dir}".encode("utf-8")).hexdigest()
+	cached_lock_path = os.path.join(pkgtools.model.work_path, "cargo-locks", f"{cache_key}.lock")
+	if os.path.exists(cached_lock_path):
+		shutil.copyfile(cached_lock_path, cargo_lock_path)
+		return cargo_lock_path
+	await run_shell(["cargo", "update"], chdir=src_dir)
+	os.makedirs(os.path.dirname(cached_lock_path), exist_ok=True)
+	shutil.copyfile(cargo_lock_path, cached_lock_path)
+	return cargo_lock_path
+
+
 async def create_crates_archive(hub, pkginfo):
 	"""
 	This is a helper function which interfaces with metatools' dynamic archive functionality and
@@ -144,20 +191,30 @@ async def create_crates_archive(hub, pkginfo):
 		return crates_archive
 
 	crates_archive = hub.Archive(crates_bundle.final_name)
-	await crates_archive.initialize(f"funtoo-crates-bundle-{pkginfo['name']}")
 
 	crates_artifacts = crates_bundle.crates_artifacts
 
-	# Fetch crates in parallel
-	await asyncio.gather(*[artifact.ensure_completed() for artifact in crates_artifacts])
+	# Fetch crates in parallel, but don't fire off hundreds of simultaneous requests to crates.io. This can be tuned by
+	# setting ``crates_fetch_concurrency`` in pkginfo:
+	fetch_slots = asyncio.Semaphore(pkginfo.get("crates_fetch_concurrency", 16))
 
-	for artifact in crates_artifacts:
-		shutil.copy(
-			artifact.blos_object.blob.path,
-			os.path.join(crates_archive.top_path, artifact.final_name),
-		)
+	async def bounded_fetch(artifact):
+		async with fetch_slots:
+			await artifact.ensure_completed()
+
+	await asyncio.gather(*[bounded_fetch(artifact) for artifact in crates_artifacts])
+
+	# Write the bundle straight from the BLOS, without blocking the ioloop, and store it:
+	tarball_path = crates_archive.temp_archive_path
+	await asyncio.get_running_loop().run_in_executor(
+		None,
+		write_crates_tarball,
+		tarball_path,
+		f"funtoo-crates-bundle-{pkginfo['name']}",
+		crates_artifacts
+	)
 
-	await crates_archive.store(key=crates_bundle["key"])
+	await crates_archive.store(key=crates_bundle["key"], existing=tarball_path)
 
 	return crates_archive
 
@@ -197,7 +254,7 @@ async def fetch_git_dependency(url, crates):
 			with open(cargo_path, "r") as cargo_file:
 				cargo_data = cargo_file.read()
 
-			cargo_data = toml.loads(cargo_data)
+			cargo_data = parse_toml(cargo_data)
 
 			cargo_package_data = cargo_data.get("package", None)
 			if cargo_package_data is None:
@@ -227,29 +284,36 @@ async def fetch_git_dependency(url, crates):
 	return archive
 
 
-async def generate_crates_metadata(lock_path=None, lock_data=None):
+def parse_toml(toml_data):
 	"""
-	This function generates crates data for the CRATES variable used in ebuilds, and also returns a
-	list of attributes to use to create new Artifacts for all crates that need to be downloaded to
-	build the project.
-	:param lock_path: If provided, open this Cargo.lock file and read its contents (string)
-	:param lock_data: If provided, this is a string containing the contents of Cargo.lock
-	:return: a tuple containing a string to use in CRATES, plus a list of attributes to use to
-					 to create Artifacts.
+	Parse ``toml_data`` (a string) using the fastest TOML parser available.
 	"""
-	if lock_path:
-		with open(lock_path, "r") as f:
-			lock_data = f.read()
+	if tomllib is not None:
+		return tomllib.loads(toml_data)
+	import toml
 
-	if lock_data is None:
-		raise ValueError(
-			"No source of lock data provided. Please provide either `lock_path` or `lock_data`."
-		)
+	return toml.loads(toml_data)
 
-	crates_dict = toml.loads(lock_data)
 
-	crates = ""
-	crates_artifacts = []
+# Parsed Cargo.lock data, indexed by a digest of the Cargo.lock contents. Autogens for several packages built from the
+# same workspace (or re-runs of the same autogen) often share a Cargo.lock, so we only parse each one once:
+CRATES_METADATA_CACHE = {}
+
+
+def parse_crates_metadata(lock_data):
+	"""
+	Parse Cargo.lock contents ``lock_data`` (a string) and return a tuple of the string to use in CRATES, a list of
+	``(name, version)`` tuples for crates to download from crates.io, and a dict of git crate names indexed by git URL.
+	Results are cached by the contents of ``lock_data``. Callers must not modify what is returned.
+	"""
+	cache_key = hashlib.blake2b(lock_data.encode("utf-8"), digest_size=16).digest()
+	if cache_key in CRATES_METADATA_CACHE:
+		return CRATES_METADATA_CACHE[cache_key]
+
+	crates_dict = parse_toml(lock_data)
+
+	crate_lines = []
+	crates_io_crates = []
 
 	git_crates = defaultdict(list)
 
@@ -279,24 +343,47 @@ async def generate_crates_metadata(lock_path=None, lock_data=None):
 
 			git_crates[url].append(name)
 
-		crates = crates + name + "-" + version + "\n"
+		crate_lines.append(f"{name}-{version}\n")
 
 		if source_origin == "crates":
-			final_name = f"{name}-{version}.crate"
-
-			crates_artifacts.append(
-				# Artifact(
-				pkgtools.ebuild.Artifact(
-					url=(
-							"https://crates.io/api/v1/crates/"
-							+ name
-							+ "/"
-							+ version
-							+ "/download"
-					),
-					final_name=final_name,
-				)
+			crates_io_crates.append((name, version))
+
+	result = CRATES_METADATA_CACHE[cache_key] = "".join(crate_lines), crates_io_crates, git_crates
+	return result
+
+
+async def generate_crates_metadata(lock_path=None, lock_data=None):
+	"""
+	This function generates crates data for the CRATES variable used in ebuilds, and also returns a
+	list of attributes to use to create new Artifacts for all crates that need to be downloaded to
+	build the project.
+	:param lock_path: If provided, open this Cargo.lock file and read its contents (string)
+	:param lock_data: If provided, this is a string containing the contents of Cargo.lock
+	:return: a tuple containing a string to use in CRATES, plus a list of attributes to use to
+					 to create Artifacts.
+	"""
+	if lock_path:
+		with open(lock_path, "r") as f:
+			lock_data = f.read()
+
+	if lock_data is None:
+		raise ValueError(
+			"No source of lock data provided. Please provide either `lock_path` or `lock_data`."
+		)
+
+	crates, crates_io_crates, git_crates = parse_crates_metadata(lock_data)
+
+	# Artifacts are always created fresh, as they track their own fetch state:
+	crates_artifacts = []
+
+	for name, version in crates_io_crates:
+		crates_artifacts.append(
+			# Artifact(
+			pkgtools.ebuild.Artifact(
+				url=f"https://crates.io/api/v1/crates/{name}/{version}/download",
+				final_name=f"{name}-{version}.crate",
 			)
+		)
 
 	for url, contained_crates in git_crates.items():
 		git_archive = await fetch_git_dependency(url, contained_crates)
@@ -323,9 +410,7 @@ async def generate_crates_from_artifact(src_artifact, src_dir_glob="*"):
 
 	src_dir = glob.glob(os.path.join(src_artifact.extract_path, src_dir_glob))[0]
 
-	cargo_lock_path = os.path.join(src_dir, "Cargo.lock")
-	if not os.path.exists(cargo_lock_path):
-		await run_shell(["cargo", "update"], chdir=src_dir)
+	cargo_lock_path = await ensure_cargo_lock(src_artifact, src_dir)
 
 	crates, crates_artifacts = await generate_crates_metadata(lock_path=cargo_lock_path)
 
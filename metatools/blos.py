@@ -11,8 +11,11 @@ class BaseLayerObjectStore(Store):
 		self.collection = "blos"
 		self.backend = FileStorageBackend(db_base_path=db_base_path)
 		self.key_spec = HashKey("hashes.sha512")
-		self.required_spec = DerivedKey(list(map(lambda x: f"hashes.{x}", hashes)))
-		self.hashes = hashes
+		# The hashes we use don't change after this point, so freeze them, and work out what we'll need to compute for
+		# each inserted blob (the size comes for free) just once:
+		self.hashes = frozenset(hashes)
+		self.computed_hashes = self.hashes - {"size"}
+		self.required_spec = DerivedKey([f"hashes.{h}" for h in sorted(self.hashes)])
 		super().__init__()
 
 	def insert_download(self, download: Download):
@@ -29,4 +32,4 @@ class BaseLayerObjectStore(Store):
 		BLOS -- we need to calculate hashes in this case.
 		"""
 		# TODO: make this asyncio so it does not block!
-		return self.write({"hashes": calc_hashes(self.hashes, blob_path)}, blob_path=blob_path)
+		return self.write({"hashes": calc_hashes(self.computed_hashes, blob_path)}, blob_path=blob_path)
@@ -16,6 +16,22 @@ async def capture_bg(cmd):
 	return proc, stdout.decode("utf-8")
 
 
+async def capture_exec(argv, cwd=None):
+	"""
+	Like ``capture_bg``, but run the command specified by the ``argv`` list directly rather than via a shell, optionally
+	in directory ``cwd``.
+
+	Return the process object and the combined string of stdout and stderr.
+	"""
+	proc = await asyncio.create_subprocess_exec(*argv,
+	cwd=cwd,
+	stdout=asyncio.subprocess.PIPE,
+	stderr=asyncio.subprocess.STDOUT)
+
+	stdout, stderr = await proc.communicate()
+	return proc, stdout.decode("utf-8")
+
+
 async def run_bg(cmd, env=None):
 	"""
 	Run command in a forked background process, await its completion -- output all its output to existing stdout/err.
@@ -25,6 +41,15 @@ async def run_bg(cmd, env=None):
 	return await proc.wait()
 
 
+async def run_bg_exec(argv, cwd=None, env=None):
+	"""
+	Like ``run_bg``, but run the command specified by the ``argv`` list directly rather than via a shell, optionally in
+	directory ``cwd``. Return its returncode.
+	"""
+	proc = await asyncio.create_subprocess_exec(*argv, cwd=cwd, env=env)
+	return await proc.wait()
+
+
 class ShellError(Exception):
 	pass
 
@@ -47,3 +72,22 @@ async def run_shell(cmd_list, abort_on_failure=True, chdir=None, logger=None):
 		else:
 			return False
 	return True
+
+
+async def run_exec(argv, abort_on_failure=True, cwd=None, logger=None):
+	"""
+	Like ``run_shell``, but run the command specified by the ``argv`` list directly rather than via a shell, optionally
+	in directory ``cwd``. No shell quoting or globbing is applied to the arguments.
+	"""
+	cmd_str = " ".join(argv)
+	if logger:
+		logger.info(f"executing: {cmd_str}")
+
+	proc, output = await capture_exec(argv, cwd=cwd)
+
+	if proc.returncode != 0:
+		if abort_on_failure:
+			raise ShellError(f"Aborted due to failed command. Error executing '{cmd_str}' in {cwd}:\n{output}\n")
+		else:
+			return False
+	return True
@@ -1,9 +1,8 @@
+import asyncio
 import os
 from collections import defaultdict
 from datetime import timedelta
 
-import yaml
-
 from metatools.blos import BaseLayerObjectStore
 from metatools.config.base import MinimalConfig
 from metatools.context import OverlayLocator, GitRepositoryLocator
@@ -11,10 +10,15 @@ from metatools.fastpull.core import IntegrityDatabase
 from metatools.fastpull.spider import WebSpider
 from metatools.fetch_cache import FileStoreFetchCache
 from metatools.tree import GitTree
-from metatools.zmq.app_core import DealerConnection
-from metatools.zmq.zmq_msg_breezyops import BreezyMessage, MessageType
+from metatools.yaml_util import load_yaml_cached, safe_load
 from metatools.release import ReleaseYAML
 
+# Hashes we calculate and store for distfiles. This is shared (read-only) by the BLOS, the integrity database and the
+# spider, so it's a frozenset to make sure nothing downstream modifies it:
+DEFAULT_HASHES = frozenset({'sha512', 'size', 'blake2b', 'sha256'})
+
+KIT_FIXUPS = "kit-fixups"
+
 
 class StoreConfig(MinimalConfig):
 	"""
@@ -25,7 +29,7 @@ class StoreConfig(MinimalConfig):
 	fpos = None
 	fastpull_scope = None
 	fastpull_session = None
-	hashes = {'sha512', 'size', 'blake2b', 'sha256'}
+	hashes = DEFAULT_HASHES
 	blos = None
 	debug = False
 	log = None
@@ -61,10 +65,9 @@ class AutogenConfig(StoreSpiderConfig):
 	release_yaml = None
 	fetch_cache = None
 	fetch_cache_interval = None
-	manifest_lines = defaultdict(set)
+	manifest_lines = None
 	fetch_attempts = 3
 	config = None
-	kit_spy = None
 	kit_fixups = None
 	filter = None
 	filter_cat = None
@@ -72,27 +75,49 @@ class AutogenConfig(StoreSpiderConfig):
 	autogens = None
 	prod = False
 	force_dynamic = False
-	logger_name = 'metatools.autogen'
+	kit_spy = None
 
 	config_files = {
 		"autogen": "~/.autogen"
 	}
+	# config_files with ~ expanded, computed once in initialize() rather than each time a config file is looked up:
+	expanded_config_files = None
 
-	@property
-	def kit_spy(self):
+	@staticmethod
+	def load_autogen_config(text):
 		"""
-		kit_spy is used for creating an autogen ID::
-			task_args["autogen_id"] = f"{pkgtools.model.kit_spy}:{task_args['gen_path'][len(base)+1:]}"
-		The autogen_id is intended to be used in the distfile integrity database, to tell use which autogen
-		referenced the artifact, in the situation where we don't have a specific BreezyBuild. This was a recent
-		add and may not be fully implemented or make sense based on our current architecture -- needs review
-		so TODO
+		Parse the contents of ``~/.autogen``. Most users have no such file, or an empty or commented-out one, so we
+		detect this and return an empty dict without running the YAML parser at all.
 		"""
-		return "/".join(self.locator.root.split("/")[-2:])
+		if not text:
+			return {}
+		if isinstance(text, bytes):
+			text = text.decode("utf-8")
+		for line in text.splitlines():
+			line = line.strip()
+			if line and not line.startswith("#"):
+				break
+		else:
+			return {}
+		config = safe_load(text)
+		# Set to empty values if non-existent:
+		return config if config is not None else {}
+
+	def load_autogen_file(self):
+		"""
+		Load ``~/.autogen``, returning an empty dict if it doesn't exist. This holds per-host authentication
+		credentials, so it is only cached in memory -- never in the on-disk YAML cache.
+		"""
+		try:
+			return load_yaml_cached(self.expanded_config_files["autogen"], parser=self.load_autogen_config)
+		except FileNotFoundError:
+			return {}
 
 	def moonbeam_msg(self, json_dict):
 		if not self.moonbeam:
 			return
+		from metatools.zmq.zmq_msg_breezyops import BreezyMessage, MessageType
+
 		msg_obj = BreezyMessage(msg_type=MessageType.INFO, service="doit", action="info", json_dict=json_dict)
 		msg_obj.send(self.moonbeam_client.client)
 		self.log.debug(f"Moonbeam: sent: {json_dict}")
@@ -112,13 +137,22 @@ class AutogenConfig(StoreSpiderConfig):
 						 autogens=None,
 						 moonbeam=False,
 						release="next"):
+		self.expanded_config_files = {name: os.path.expanduser(path) for name, path in self.config_files.items()}
+		# Load ~/.autogen in a thread while we set up stores and locate/update repositories. We need it at the end:
+		loop = asyncio.get_running_loop()
+		config_future = loop.run_in_executor(None, self.load_autogen_file)
 		await super().initialize(fastpull_scope=fastpull_scope, debug=debug)
 		self.release = release
 		self.immediate = immediate
 		self.moonbeam = moonbeam
 		if self.moonbeam:
+			# zmq is only needed to talk to moonbeam (i.e. when run from merge-kits), so don't import it otherwise:
+			from metatools.zmq.app_core import DealerConnection
+
 			self.moonbeam_client = DealerConnection("moonbeam", endpoint=f"ipc://{self.moonbeam_socket}")
 		self.fetch_cache = FileStoreFetchCache(db_base_path=self.store_path)
+		# Manifest lines to write at the end of the run, per Manifest file. Per-instance, not shared via the class:
+		self.manifest_lines = defaultdict(set)
 
 		# Process specified autogens instead of recursing:
 		self.autogens = autogens
@@ -131,25 +165,30 @@ class AutogenConfig(StoreSpiderConfig):
 		if self.filter_cat or self.filter_pkg:
 			self.filter = True
 
-		self.config = yaml.safe_load(self.get_file("autogen"))
-		# Set to empty values if non-existent:
-		if self.config is None:
-			self.config = {}
-
 		self.locator = OverlayLocator()
+		# kit_spy is used for creating an autogen ID::
+		#   task_args["autogen_id"] = f"{pkgtools.model.kit_spy}:{task_args['gen_path'][len(base)+1:]}"
+		# The autogen_id is intended to be used in the distfile integrity database, to tell use which autogen
+		# referenced the artifact, in the situation where we don't have a specific BreezyBuild. This was a recent
+		# add and may not be fully implemented or make sense based on our current architecture -- needs review
+		# so TODO
+		#
+		# This is used for every autogen task, and ``self.locator`` doesn't change once set, so we compute it here:
+		head, sep, last = self.locator.root.rpartition("/")
+		self.kit_spy = f"{head.rpartition('/')[2]}/{last}" if sep else last
 		self.current_repo = GitRepositoryLocator()
-		current_repo_name = self.current_repo.root.split("/")[-1]
-		if current_repo_name.startswith("kit-fixups"):
+		current_repo_name = os.path.basename(self.current_repo.root)
+		if current_repo_name.startswith(KIT_FIXUPS):
 			self.kit_fixups_repo = self.current_repo
 		else:
 			# We are likely running autogen in a non-kit-fixups kit (like foo-kit-sources.)
 			# We require a locally-available kit-fixups repo to access generators in kit-fixups.
 
-			kit_fixups_root = os.path.join(self.source_trees, "kit-fixups")
+			kit_fixups_root = os.path.join(self.source_trees, KIT_FIXUPS)
 			if not fast:
 				self.log.info("Cloning/updating kit-fixups to access generators (--fast to use as-is)")
 				self.kit_fixups = GitTree(
-					name='kit-fixups',
+					name=KIT_FIXUPS,
 					root=kit_fixups_root,
 					model=self,
 					url=fixups_url,
@@ -157,15 +196,18 @@ class AutogenConfig(StoreSpiderConfig):
 					keep_branch=True
 				)
 				await self.kit_fixups.initialize()
+				# We just cloned or updated it, so we know exactly where its root is:
+				self.kit_fixups_repo = GitRepositoryLocator.from_root(self.kit_fixups.root)
 			else:
 				self.log.info(f"Generators will be sourced from {kit_fixups_root}")
-			self.kit_fixups_repo = GitRepositoryLocator(start_path=kit_fixups_root)
+				self.kit_fixups_repo = GitRepositoryLocator(start_path=kit_fixups_root)
 
 		if fetch_cache_interval is not None:
 			# use our default unless another timedelta specified:
 			self.fetch_cache_interval = fetch_cache_interval
 		else:
 			self.fetch_cache_interval = timedelta(minutes=15)
+		self.config = await config_future
 		self.release_yaml = ReleaseYAML(release=release, prod=prod, kit_fixups=self.kit_fixups_repo)
 
 # vim: ts=4 sw=4 noet
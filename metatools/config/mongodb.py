@@ -1,9 +1,28 @@
+import threading
+
 from pymongo import MongoClient
 
 MONGODB_NAME = 'metatools2'
 
+"""
+`MONGO_CLIENT` is the MongoClient shared by everything in the process that uses MongoDB. A MongoClient is thread-safe
+and maintains its own connection pool, so there is no need to create (and connect) a new one for each collection we
+access. It is created on first use by `get_client`.
+"""
+
+MONGO_CLIENT = None
+MONGO_CLIENT_LOCK = threading.Lock()
+
+
+def get_client():
+	global MONGO_CLIENT
+	if MONGO_CLIENT is None:
+		with MONGO_CLIENT_LOCK:
+			if MONGO_CLIENT is None:
+				MONGO_CLIENT = MongoClient(appname="metatools")
+	return MONGO_CLIENT
+
 
 def get_collection(collection_name):
-	client = MongoClient()
-	db = getattr(client, MONGODB_NAME)
+	db = getattr(get_client(), MONGODB_NAME)
 	return getattr(db, collection_name)
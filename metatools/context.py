@@ -8,6 +8,10 @@ class Locator:
 	start_path = None
 	root: str = None
 	expected_files = []
+	# Roots we have already found, by (expected_files, start_path). Several parts of metatools locate the same
+	# repositories from the same starting points, and the answer won't change during a run, so each walk is done once.
+	# Failures are not cached.
+	found_roots = {}
 	"""
 	This method will look, from the current directory, and find the 'context' of where
 	we are in a kit-fixups repository, so we know where the main kit-fixups repository
@@ -42,9 +46,24 @@ class Locator:
 
 	def __init__(self, start_path=None):
 		self.start_path = start_path if start_path else os.getcwd()
-		self.root = self.find_root()
-		if self.root is None:
-			raise ConfigurationError(f"Could not determine context in {self.start_path}. Trying to find these marker files: {self.expected_files}")
+		key = (tuple(self.expected_files), self.start_path)
+		if key not in Locator.found_roots:
+			root = self.find_root()
+			if root is None:
+				raise ConfigurationError(f"Could not determine context in {self.start_path}. Trying to find these marker files: {self.expected_files}")
+			Locator.found_roots[key] = root
+		self.root = Locator.found_roots[key]
+
+	@classmethod
+	def from_root(cls, root):
+		"""
+		Return a locator for ``root``, which the caller already knows to be the root we're looking for (for example,
+		a ``GitTree`` we have just initialized), without walking the filesystem.
+		"""
+		locator = cls.__new__(cls)
+		locator.start_path = locator.root = root
+		Locator.found_roots[(tuple(cls.expected_files), root)] = root
+		return locator
 
 
 class OverlayLocator(Locator):
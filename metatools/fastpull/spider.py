@@ -1,5 +1,6 @@
 import asyncio
 import hashlib
+import json
 import logging
 import os
 import random
@@ -83,6 +84,9 @@ class Download:
     of functions to call. The first function will get the result of the download as an argument.
     """
 
+	# Only update the rich progress display after at least this many bytes have been received, rather than per-chunk:
+	progress_interval = 1 << 20
+
 	def __init__(self, spider, request: FetchRequest, hashes=None, completion_pipeline=None):
 		self.spider = spider
 		self.request = request
@@ -92,6 +96,7 @@ class Download:
 		self.final_data = None
 		self._temp_path = None
 		self.decoded_bytes_received = None
+		self.progress_reported = 0
 		self.xfer_bytes_total = None
 		self.fd = None
 		self.hash_calc_dict = None
@@ -201,11 +206,11 @@ class Download:
 						self.download_task = self.spider.progress.add_task("Download", filename=filename, total=self.xfer_bytes_total)
 						log.debug(f"Added download task {self.download_task}, total {self.xfer_bytes_total}")
 					# DO NOT USE aiter_raw(), below!! It will result in invalid downloads from some sites!
+					# aiter_bytes() never yields empty chunks, and on_chunk() writes and hashes each chunk in place
+					# (no copies are made), so the loop is kept as tight as possible:
 					async for chunk in response.aiter_bytes():
-						bytes_received = on_chunk(chunk, response)
-						self.decoded_bytes_received += bytes_received
-						if bytes_received:
-							received_data = True
+						self.decoded_bytes_received += on_chunk(chunk, response)
+						received_data = True
 					completed = True
 			except httpx.RequestError as e:
 				# TODO: it is possible for resumed download to continually fail. This has been seen with a
@@ -258,6 +263,7 @@ class Download:
 		self.fd = open(self.temp_path, "wb")
 		self.hash_calc_dict = {}
 		self.decoded_bytes_received = 0
+		self.progress_reported = 0
 		self.xfer_bytes_total = None
 		self.start_time = datetime.utcnow()
 		for h in self.hashes:
@@ -265,16 +271,16 @@ class Download:
 
 	def on_chunk(self, chunk, response):
 		got_bytes = len(chunk)
-		if not got_bytes:
-			return 0
 		self.fd.write(chunk)
 		for hash in self.hashes:
 			self.hash_calc_dict[hash].update(chunk)
-		if self.download_task is not None:
+		received = self.decoded_bytes_received + got_bytes
+		if self.download_task is not None and received - self.progress_reported >= self.progress_interval:
+			self.progress_reported = received
 			if self.xfer_bytes_total:
-				self.spider.progress.update(self.download_task, completed=self.decoded_bytes_received)
+				self.spider.progress.update(self.download_task, completed=received)
 			else:
-				self.spider.progress.update(self.download_task, completed=self.decoded_bytes_received, total=self.decoded_bytes_received)
+				self.spider.progress.update(self.download_task, completed=received, total=received)
 		return got_bytes
 
 	async def launch(self) -> None:
@@ -541,11 +547,11 @@ class WebSpider:
 		return client
 
 	def get_headers_and_auth(self, request):
+		# Always hand out a copy -- callers add conditional (If-None-Match, If-Modified-Since) and Range headers to
+		# what we return, and these must never leak into the class-wide fetch_headers used by other requests:
+		headers = self.fetch_headers.copy()
 		if request.extra_headers:
-			headers = self.fetch_headers.copy()
 			headers.update(request.extra_headers)
-		else:
-			headers = self.fetch_headers
 		if request.username and request.password:
 			auth = (request.username, request.password)
 		else:
@@ -635,8 +641,10 @@ New logic:"""
 					                 f"HTTP fetch Error: {request.url}: {response.status_code}: {response.reason_phrase} {err_response}",
 					                 retry=retry)
 				if is_json:
+					# Hand the raw body straight to the JSON decoder, which detects the UTF encoding itself. This avoids
+					# having httpx detect the charset and materialize the whole body as a str first:
 					try:
-						return response.headers, response.json()
+						return response.headers, json.loads(response.content)
 					except JSONDecodeError as jde:
 						# TODO: report this via moonbeam
 						raise FetchError(request, f"Error decoding JSON: {repr(jde)}", retry=False)
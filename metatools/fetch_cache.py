@@ -2,9 +2,7 @@
 
 import logging
 from datetime import datetime
-import pymongo
 
-from metatools.config.mongodb import get_collection
 from metatools.store import Store, FileStorageBackend, DerivedKey, NotFoundError, StoreObject
 
 log = logging.getLogger('metatools.autogen')
@@ -74,13 +72,31 @@ class FileStoreFetchCache(FetchCache):
 
 
 class MongoDBFetchCache(FetchCache):
-
-	fc = None
-
-	def __init__(self):
-		self.fc = get_collection('fetch_cache')
-		self.fc.create_index([("method_name", pymongo.ASCENDING), ("url", pymongo.ASCENDING)])
-		self.fc.create_index("last_failure_on", partialFilterExpression={"last_failure_on": {"$exists": True}})
+	"""
+	MongoDB-backed fetch cache. We don't connect to MongoDB (or even import pymongo) until the cache is first used, so
+	that merely instantiating this class -- or importing this module to use the ``FileStoreFetchCache`` -- is cheap.
+	Indexes are ensured only once per process.
+	"""
+
+	_fc = None
+	indexes_ensured = False
+	# Fields we don't return from read(). The failures list grows with every failed fetch and isn't used by callers, so
+	# there is no point in pulling it over the wire on every cache lookup:
+	read_projection = {"_id": 0, "failures": 0}
+
+	@property
+	def fc(self):
+		if self._fc is None:
+			import pymongo
+			from metatools.config.mongodb import get_collection
+
+			fc = get_collection('fetch_cache')
+			if not MongoDBFetchCache.indexes_ensured:
+				fc.create_index([("method_name", pymongo.ASCENDING), ("url", pymongo.ASCENDING)])
+				fc.create_index("last_failure_on", partialFilterExpression={"last_failure_on": {"$exists": True}})
+				MongoDBFetchCache.indexes_ensured = True
+			self._fc = fc
+		return self._fc
 
 	async def write(self, key_dict, body=None):
 		"""
@@ -110,7 +126,7 @@ class MongoDBFetchCache(FetchCache):
 		In the case the document is not found or does not meet criteria, we will raise a ``CacheMiss`` exception.
 		"""
 
-		result = self.fc.find_one(key_dict)
+		result = self.fc.find_one(key_dict, projection=self.read_projection)
 		if result is None or "fetched_on" not in result:
 			raise CacheMiss()
 		elif refresh_interval is not None:
@@ -2,6 +2,7 @@ import logging
 import re
 import types
 from enum import Enum
+from functools import lru_cache
 
 from metatools.version import generic
 
@@ -53,6 +54,33 @@ class ReleaseVersionMatch(Enum):
     STANDARD = VersionMatch.GRABBY.value
 
 
+# Flags a str pattern gets without any inline flags, used to detect filters that set global flags:
+DEFAULT_REGEX_FLAGS = re.compile("").flags
+
+
+@lru_cache(maxsize=None)
+def combine_filters(filters: tuple):
+    """
+    Combine a tuple of ``filter`` regex strings into a single compiled alternation, so that a tag only needs to be
+    checked once rather than once per filter. Results are cached, as the same filter list is typically used for every
+    tag or release being scanned.
+
+    Only plain strings without groups or global inline flags (like ``(?i)``) are combined -- compiled patterns, group
+    numbering, backreferences and flags don't survive being pasted into a larger pattern. If any filter can't be
+    combined, None is returned and each filter should be checked individually.
+    """
+    if not all(isinstance(each_filter, str) for each_filter in filters):
+        return None
+    try:
+        for each_filter in filters:
+            compiled = re.compile(each_filter)
+            if compiled.groups or compiled.flags != DEFAULT_REGEX_FLAGS:
+                return None
+        return re.compile("|".join(f"(?:{each_filter})" for each_filter in filters))
+    except re.error:
+        return None
+
+
 class Matcher:
     """
     Big picture: This class abstracts versioning handling, so we can have pluggable version handlers that
@@ -126,9 +154,12 @@ class RegexMatcher(Matcher):
                 if re.match(filter, input):
                     return None
             elif isinstance(filter, list):
-                for each_filter in filter:
-                    if re.match(each_filter, input):
+                combined = combine_filters(tuple(filter))
+                if combined is not None:
+                    if combined.match(input):
                         return None
+                elif any(re.match(each_filter, input) for each_filter in filter):
+                    return None
         match = self.regex.search(input)
         if match:
             return match.groups()[0]
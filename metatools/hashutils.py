@@ -1,21 +1,35 @@
 import hashlib
+import mmap
+import os
+
+# Size of the slices of a file we feed to the hash objects at a time (hashlib releases the GIL while hashing each one):
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
 
 
 def calc_hashes(hashes: set, fn):
+	"""
+	Calculate the requested ``hashes`` of file ``fn`` in a single pass, returning a dict of hex digests, plus the file's
+	``size``. The file is mmap()ed, so its data is handed to each hash object straight from the page cache, without being
+	copied into a Python buffer first.
+	"""
 	# TODO: convert to async so it does not block!
 	hashes = hashes - {"size"}
+	if not hashes:
+		# Only the size was asked for, which doesn't require reading the file at all:
+		return {"size": os.stat(fn).st_size}
 	hash_objs = {}
 	for h in hashes:
 		hash_objs[h] = getattr(hashlib, h)()
-	filesize = 0
 	with open(fn, "rb") as myf:
-		while True:
-			data = myf.read(1280000)
-			if not data:
-				break
-			for h in hash_objs:
-				hash_objs[h].update(data)
-			filesize += len(data)
+		filesize = os.fstat(myf.fileno()).st_size
+		# mmap() can't map an empty file -- but then there is nothing to hash, either:
+		if filesize:
+			with mmap.mmap(myf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				with memoryview(mm) as mv:
+					for pos in range(0, filesize, HASH_CHUNK_SIZE):
+						with mv[pos:pos + HASH_CHUNK_SIZE] as chunk:
+							for hash_obj in hash_objs.values():
+								hash_obj.update(chunk)
 	final_data = {}
 	for h in hashes:
 		final_data[h] = hash_objs[h].hexdigest()
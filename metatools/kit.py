@@ -68,16 +68,39 @@ class EclassHashCollection:
 			f"EclassHashCollection: Adding {len(other.hashes.keys())} and {len(self.hashes.keys())} -- now have {len(new_obj.hashes.keys())}")
 		return new_obj
 
+	# md5 digests of eclasses we have already hashed, indexed by path, and validated using the file's stat info.
+	# This is shared by all collections so that re-scanning an eclass directory (such as when a kit is regenerated
+	# more than once in the same process) doesn't require re-reading unchanged eclasses:
+	md5_cache = {}
+
 	def scan_path(self, eclass_scan_path):
+		"""
+		Record the md5 of every eclass in ``eclass_scan_path``. This is done in two passes -- first, we scan the directory
+		and pick up any digests we already have in ``md5_cache``. Then, any eclasses that are new or have changed are
+		hashed in parallel using a ThreadPoolExecutor (hashlib releases the GIL while hashing.)
+		"""
 		scan_count = 0
+		to_hash = []
 		if os.path.isdir(eclass_scan_path):
-			for eclass in os.listdir(eclass_scan_path):
-				if not eclass.endswith(".eclass"):
-					continue
-				eclass_path = os.path.join(eclass_scan_path, eclass)
-				eclass_name = eclass[:-7]
-				self.hashes[eclass_name] = get_md5(eclass_path)
-				scan_count += 1
+			with os.scandir(eclass_scan_path) as entries:
+				for entry in entries:
+					if not entry.name.endswith(".eclass"):
+						continue
+					eclass_name = entry.name[:-7]
+					st = entry.stat()
+					stat_key = (st.st_ino, st.st_size, st.st_mtime_ns)
+					cached = self.md5_cache.get(entry.path)
+					if cached is not None and cached[0] == stat_key:
+						self.hashes[eclass_name] = cached[1]
+					else:
+						to_hash.append((eclass_name, entry.path, stat_key))
+					scan_count += 1
+		if to_hash:
+			with ThreadPoolExecutor(max_workers=cpu_count()) as executor:
+				digests = executor.map(get_md5, [path for eclass_name, path, stat_key in to_hash])
+				for (eclass_name, path, stat_key), md5 in zip(to_hash, digests):
+					self.md5_cache[path] = (stat_key, md5)
+					self.hashes[eclass_name] = md5
 		model.log.debug(f"EclassHashCollection: Found {scan_count} eclasses in path {eclass_scan_path}.")
 
 
@@ -543,7 +566,8 @@ class KitGenerator:
 
 		kit_copy_info = self.kit.eclass_include_info()
 		mask = kit_copy_info["mask"]
-		file_mask = map(lambda x: f"{x}.eclass", list(mask))
+		# This may be used by more than one SyncDir step, so it must not be a one-shot iterator:
+		file_mask = [f"{x}.eclass" for x in mask]
 		my_steps = []
 		for srepo_name, eclass_name_list in kit_copy_info["include"].items():
 			copy_eclasses = set()
@@ -558,11 +582,9 @@ class KitGenerator:
 						model.log.warn(
 							f"For kit {self.kit.name}, {eclass_item} is both included and excluded in the release YAML.")
 			if copy_eclasses:
-				copy_tuples = []
-				for item in copy_eclasses:
-					if item.split("/")[-1] not in mask:
-						file_path = f"eclass/{item}.eclass"
-						copy_tuples.append((file_path, file_path))
+				copy_tuples = [
+					(f"eclass/{item}.eclass",) * 2 for item in copy_eclasses if item.rpartition("/")[2] not in mask
+				]
 				my_steps.append(metatools.steps.CopyFiles(self.kit.source.repositories[srepo_name].tree, copy_tuples))
 		return my_steps
 
@@ -813,6 +835,10 @@ class MetaRepoJobController:
 				else:
 					other_jobs_list.append(kit_job)
 
+		# Get all source repositories cloned up front, in parallel -- each kit then only needs to check out the snapshot
+		# it wants:
+		await model.release_yaml.initialize_all_sources()
+
 		master_pool = KitExecutionPool(jobs=master_jobs_list, method=method)
 		success = await master_pool.run()
 		if not success:
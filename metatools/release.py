@@ -1,26 +1,47 @@
+import asyncio
 import logging
 import os
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from itertools import chain
 
-import yaml
 from metatools.model import get_model
 
 from metatools.context import GitRepositoryLocator
 from metatools.tree import GitTree
-from metatools.yaml_util import YAMLReader
+from metatools.yaml_util import YAMLReader, load_yaml_cached
 from subpop.config import ConfigurationError
 
 log = logging.getLogger("metatools")
 model = get_model("metatools")
 
+# Used to expand {{cur_year}} in copyright text. A merge run doesn't live long enough for this to go stale:
+CUR_YEAR = str(datetime.now().year)
+
+
+@lru_cache(maxsize=None)
+def kit_dir_contents(root, name):
+	"""
+	Return the set of entries in the ``{root}/{name}`` kit directory of kit-fixups, read with a single ``os.scandir()``.
+	This is cached, as variants of the same kit share this directory. An empty set is returned if it doesn't exist.
+	"""
+	try:
+		with os.scandir(f"{root}/{name}") as it:
+			return frozenset(entry.name for entry in it)
+	except FileNotFoundError:
+		return frozenset()
+
+
 class SourceRepository:
 	"""
 	This SourceRepository represents a single source repository referenced in the YAML. This source repository
 	is used as a source tree for copying in ebuilds and eclasses into a kit.
 	"""
 
+	__slots__ = ("yaml", "name", "copyright", "url", "eclasses", "notes", "tree", "src_sha1", "branch", "initialized")
+
 	def __init__(self, yaml=None, name=None, copyright=None, url=None, eclasses=None, src_sha1=None, branch=None,
 				 notes=None):
 		self.yaml = yaml
@@ -41,7 +62,7 @@ class SourceRepository:
 		if self.initialized:
 			return
 		model.log.debug(
-			f"Initializing: Source Repository {self.name} branch: {self.branch} SHA1: {self.src_sha1} {self.url}")
+			"Initializing: Source Repository %s branch: %s SHA1: %s %s", self.name, self.branch, self.src_sha1, self.url)
 		self.tree = GitTree(
 			self.name,
 			url=self.url,
@@ -50,6 +71,7 @@ class SourceRepository:
 			commit_sha1=self.src_sha1,
 			origin_check=False,
 			reclone=False,
+			clone_filter="blob:none",
 			model=model
 		)
 		await self.tree.initialize()
@@ -59,7 +81,7 @@ class SourceRepository:
 		try:
 			return self.tree.find_license(license)
 		except FileNotFoundError:
-			model.log.error(f"No license named '{license}' found in SourceRepository {self.name}")
+			model.log.error("No license named '%s' found in SourceRepository %s", license, self.name)
 
 
 class SharedSourceRepository(SourceRepository):
@@ -76,6 +98,8 @@ class SharedSourceRepository(SourceRepository):
 	such as a gentoo-staging repo, even if different source collections leverage different SHA1 snapshots.
 	"""
 
+	__slots__ = ()
+
 	def __init__(self, yaml=None, name=None, copyright=None, url=None, eclasses=None, notes=None):
 		self.yaml = yaml
 		assert yaml is not None
@@ -91,17 +115,19 @@ class SharedSourceRepository(SourceRepository):
 		if self.tree:
 			if (branch is None or self.tree.branch == branch) and src_sha1 == self.tree.commit_sha1:
 				model.log.debug(
-					f"Keeping existing source repository {self.name} branch: {self.tree.branch} SHA1: {self.tree.commit_sha1} {self.url}")
+					"Keeping existing source repository %s branch: %s SHA1: %s %s",
+					self.name, self.tree.branch, self.tree.commit_sha1, self.url)
 				return
 			else:
 				model.log.debug(
-					f"src repo {self.name}: initialize: {self.tree.branch}/{self.tree.commit_sha1} -> {branch}/{src_sha1}")
+					"src repo %s: initialize: %s/%s -> %s/%s",
+					self.name, self.tree.branch, self.tree.commit_sha1, branch, src_sha1)
 				model.log.debug(
-					f"Checkout: Source Repository {self.name} branch: {branch} SHA1: {src_sha1} {self.url}")
+					"Checkout: Source Repository %s branch: %s SHA1: %s %s", self.name, branch, src_sha1, self.url)
 				await self.tree.git_checkout(branch=branch, sha1=src_sha1)
 		else:
 			model.log.debug(
-				f"Initializing: Source Repository {self.name} branch: {branch} SHA1: {src_sha1} {self.url}")
+				"Initializing: Source Repository %s branch: %s SHA1: %s %s", self.name, branch, src_sha1, self.url)
 			self.tree = GitTree(
 				self.name,
 				url=self.url,
@@ -110,6 +136,7 @@ class SharedSourceRepository(SourceRepository):
 				commit_sha1=src_sha1,
 				origin_check=False,
 				reclone=False,
+				clone_filter="blob:none",
 				model=model
 			)
 			await self.tree.initialize()
@@ -122,6 +149,8 @@ class SourceCollection:
 	with auto-generated kits that can reference multiple repos in their packages.yaml.
 	"""
 
+	__slots__ = ("yaml", "name", "repo_defs", "repositories")
+
 	def __init__(self, name=None, yaml=None, repo_defs=None):
 		self.yaml = yaml
 		self.name = name
@@ -129,6 +158,22 @@ class SourceCollection:
 		self.repo_defs = repo_defs
 		self.repositories = OrderedDict()
 
+	def get_repository(self, repo_name):
+		"""
+		Return the SharedSourceRepository for ``repo_name``, which is shared by all source collections in the release.
+		If it doesn't exist yet, it is created (but not initialized.)
+		"""
+		# If repo already exists, don't create it from scratch. Should be faster:
+		if repo_name in self.yaml.all_repo_objs:
+			return self.yaml.all_repo_objs[repo_name]
+		# note that src_sha1 and branch get passed as keyword arguments to initialize().
+		kwargs = self.repo_defs[repo_name].copy()
+		for arg in ["src_sha1", "branch"]:
+			if arg in kwargs:
+				del kwargs[arg]
+		repo = self.yaml.all_repo_objs[repo_name] = SharedSourceRepository(**kwargs, yaml=self.yaml, name=repo_name)
+		return repo
+
 	def find_license(self, license):
 		for repo in reversed(self.repositories.keys()):
 			try:
@@ -136,7 +181,7 @@ class SourceCollection:
 			except FileNotFoundError:
 				continue
 			return license
-		model.log.error(f"No license named '{license}' found in SourceCollection {self.name}")
+		model.log.error("No license named '%s' found in SourceCollection %s", license, self.name)
 
 	async def initialize(self, repo_names=None):
 
@@ -148,30 +193,22 @@ class SourceCollection:
 		Note: Due to the nature of what we're doing, these repositories are all SharedSourceRepositories.
 		"""
 
+		if repo_names is not None and not isinstance(repo_names, (set, frozenset)):
+			repo_names = set(repo_names)
+		# Each repository is its own git tree, so check them all out concurrently rather than one after another. Each
+		# one's initialization is started as soon as we have its repository object:
+		repo_inits = []
 		for repo_name, repo_def in self.repo_defs.items():
-			# Skip any repos that we aren't using right now....
-			if repo_names is not None and repo_name not in repo_names:
-				continue
-			# If repo already exists, don't create it from scratch. Should be faster:
-			if repo_name in self.yaml.all_repo_objs:
-				self.repositories[repo_name] = self.yaml.all_repo_objs[repo_name]
-			else:
-				# note that src_sha1 and branch get passed as keyword arguments to initialize() in the next loop.
-				kwargs = repo_def.copy()
-				for arg in ["src_sha1", "branch"]:
-					if arg in kwargs:
-						del kwargs[arg]
-				self.yaml.all_repo_objs[repo_name] = self.repositories[repo_name] = SharedSourceRepository(**kwargs,
-																										   yaml=self.yaml,
-																										   name=repo_name)
-		for repo_name, repo in self.repositories.items():
-			branch = None
-			src_sha1 = None
-			if "src_sha1" in self.repo_defs[repo_name]:
-				src_sha1 = self.repo_defs[repo_name]["src_sha1"]
-			if "branch" in self.repo_defs[repo_name]:
-				branch = self.repo_defs[repo_name]["branch"]
-			await repo.initialize(branch=branch, src_sha1=src_sha1)
+			repo = self.repositories.get(repo_name)
+			if repo is None:
+				# Skip any repos that we aren't using right now....
+				if repo_names is not None and repo_name not in repo_names:
+					continue
+				repo = self.repositories[repo_name] = self.get_repository(repo_name)
+			repo_inits.append(asyncio.create_task(
+				repo.initialize(branch=repo_def.get("branch"), src_sha1=repo_def.get("src_sha1"))
+			))
+		await asyncio.gather(*repo_inits)
 		model.current_source_def = self
 
 
@@ -184,7 +221,13 @@ class Kit:
 	Don't use the class directly. Use ``SourcedKit()`` or ``AutoGeneratedKit()``, below.
 	"""
 
-	source = None
+	# Releases define many kits, so keep them lightweight -- subclasses define __slots__ too:
+	__slots__ = (
+		"kit_fixups", "release", "name", "stability", "branch", "eclasses", "priority", "aliases", "masters", "sync_url",
+		"settings", "copyright_cache", "source"
+	)
+	# Expanded sync_url templates, keyed by (sync_url, kit name) -- variants of the same kit share the same sync_url:
+	sync_url_cache = {}
 
 	def __init__(self, locator, release=None, name=None, stability=None, branch=None, eclasses=None, priority=None,
 				 aliases=None, masters=None, sync_url=None, settings=None):
@@ -193,36 +236,57 @@ class Kit:
 		self.release = release
 		self.name = name
 		# For a sourced kit, this is a SourceRepository. For an autogenerated kit, it is a collection of SourceRepositories (SourceCollection):
+		self.source = None
 		self.stability = stability
 		self.branch = branch
 		self.eclasses = eclasses if eclasses is not None else {}
 		self.priority = priority
 		self.aliases = aliases if aliases else []
 		self.masters = masters if masters else []
-		self.sync_url = sync_url.format(kit_name=name) if sync_url else None
+		self.sync_url = self.expand_sync_url(sync_url, name) if sync_url else None
 		self.settings = settings if settings is not None else {}
+		self.copyright_cache = {}
+
+	@classmethod
+	def expand_sync_url(cls, sync_url, name):
+		key = (sync_url, name)
+		try:
+			return cls.sync_url_cache[key]
+		except KeyError:
+			url = cls.sync_url_cache[key] = sync_url.format(kit_name=name)
+			return url
 
 	async def initialize_sources(self):
 		pass
 
 	def get_copyright_rst(self):
-		cur_year = str(datetime.now().year)
-		out = self.release.get_default_copyright_rst().replace("{{cur_year}}", cur_year)
+		cur_year = CUR_YEAR
 		if isinstance(self, AutoGeneratedKit):
-			for source_name in sorted(self.source.repositories.keys()):
-				source = self.source.repositories[source_name]
-				if source.copyright:
-					out += source.copyright.replace("{{cur_year}}", cur_year)
+			# The repositories in our source collection are only known once sources are initialized, so they are part
+			# of the cache key:
+			source_names = tuple(sorted(self.source.repositories.keys()))
 		elif isinstance(self, SourcedKit):
-			if self.source.copyright:
-				out += self.source.copyright.replace("{{cur_year}}", cur_year)
+			source_names = None
 		else:
 			raise TypeError("Unrecognized kit format")
+		cache_key = (cur_year, source_names)
+		if cache_key in self.copyright_cache:
+			return self.copyright_cache[cache_key]
+		out = self.release.get_default_copyright_rst().replace("{{cur_year}}", cur_year)
+		if source_names is not None:
+			for source_name in source_names:
+				source = self.source.repositories[source_name]
+				if source.copyright:
+					out += source.copyright.replace("{{cur_year}}", cur_year)
+		elif self.source.copyright:
+			out += self.source.copyright.replace("{{cur_year}}", cur_year)
+		self.copyright_cache[cache_key] = out
 		return out
 
 
 class SourcedKit(Kit):
-	source: SourceRepository = None
+	__slots__ = ()
+	source: SourceRepository
 
 	def __init__(self, source: SourceRepository = None, **kwargs):
 		super().__init__(**kwargs)
@@ -233,12 +297,13 @@ class SourcedKit(Kit):
 
 
 class AutoGeneratedKit(Kit):
-	_package_data = None
-	source: SourceCollection = None
+	__slots__ = ("_package_data",)
+	source: SourceCollection
 
 	def __init__(self, source: SourceCollection = None, **kwargs):
 		super().__init__(**kwargs)
 		self.source = source
+		self._package_data = None
 
 	@property
 	def package_data(self):
@@ -246,6 +311,20 @@ class AutoGeneratedKit(Kit):
 			self._package_data = self._get_package_data()
 		return self._package_data
 
+	@property
+	def repo_names(self):
+		"""
+		The names of the source repositories referenced by our packages.yaml.
+		"""
+		# We only need the names of the referenced repos, so don't walk the package lists via get_kit_items(). Use a set,
+		# since the same repo is typically referenced many times:
+		repo_names = set()
+		for section in ("packages", "copyfiles", "eclasses"):
+			if section in self.package_data:
+				for package_set in self.package_data[section]:
+					repo_names.add(next(iter(package_set)))
+		return repo_names
+
 	async def initialize_sources(self):
 		"""
 		This method is used to get the SourceCollection's SharedSourceRepository objects initialized so we are ready to copy ebuilds/eclasses from
@@ -254,55 +333,84 @@ class AutoGeneratedKit(Kit):
 		The use of repo_names exists to inform the initialize() call of what repos we are actually going to use. There is no point in performing
 		significant IO to initialize repos that we are not actually using.
 		"""
-		repo_names = []
-		for repo_name, extra in self.get_kit_items():
-			repo_names.append(repo_name)
-		for repo_name, extra in self.get_kit_items(section="copyfiles"):
-			repo_names.append(repo_name)
-		for repo_name, extra in self.get_kit_items(section="eclasses"):
-			repo_names.append(repo_name)
-		await self.source.initialize(repo_names=repo_names)
+		await self.source.initialize(repo_names=self.repo_names)
+
+	@property
+	def packages_yaml_candidates(self):
+		# Branch-specific packages.yaml, falling back to curated packages.yaml, then kit-wide packages.yaml. We can rule
+		# out the first two without touching the filesystem if their directory doesn't exist:
+		contents = kit_dir_contents(self.kit_fixups.root, self.name)
+		candidates = []
+		if str(self.branch) in contents:
+			candidates.append(self.specific_packages_yaml)
+		if "curated" in contents:
+			candidates.append(f"{self.kit_fixups.root}/{self.name}/curated/packages.yaml")
+		candidates.append(f"{self.kit_fixups.root}/{self.name}/packages.yaml")
+		return candidates
 
 	@property
 	def packages_yaml(self):
-		# Look for branch-specific packages.yaml:
-		fn = self.specific_packages_yaml
-		# Fallback to curated packages.yaml:
-		if not os.path.exists(fn):
-			fn = f"{self.kit_fixups.root}/{self.name}/curated/packages.yaml"
-		# Fallback to kit-wide packages.yaml:
-		if not os.path.exists(fn):
-			fn = f"{self.kit_fixups.root}/{self.name}/packages.yaml"
-		return fn
+		candidates = self.packages_yaml_candidates
+		for fn in candidates[:-1]:
+			if os.path.exists(fn):
+				return fn
+		return candidates[-1]
 
 	@property
 	def specific_packages_yaml(self):
 		return f"{self.kit_fixups.root}/{self.name}/{self.branch}/packages.yaml"
 
 	def _get_package_data(self):
-		with open(self.packages_yaml, "r") as f:
-			return yaml.safe_load(f)
+		# Rather than checking for each candidate and then loading it, just try to load each in turn -- a missing file
+		# only costs us the single failed stat() in load_yaml_cached():
+		cache_dir = os.path.join(model.store_path, "yaml_cache")
+		candidates = self.packages_yaml_candidates
+		for fn in candidates[:-1]:
+			try:
+				return load_yaml_cached(fn, cache_dir)
+			except FileNotFoundError:
+				continue
+		return load_yaml_cached(candidates[-1], cache_dir)
 
-	def yaml_walk(self, yaml_dict):
+	def yaml_leaf_lists(self, yaml_dict):
 		"""
-		This method will scan a section of loaded YAML and return all list elements -- the leaf items.
+		This method will scan a section of loaded YAML and yield each list it contains -- the lists of leaf items.
+
+		This is done iteratively, using a stack of iterators over the dicts we're inside of, so lists are yielded in the
+		same (depth-first) order as they appear in the YAML.
 		"""
-		retval = []
-		for key, item in yaml_dict.items():
-			if isinstance(item, dict):
-				retval += self.yaml_walk(item)
-			elif isinstance(item, list):
-				retval += item
+		stack = [iter(yaml_dict.values())]
+		while stack:
+			for item in stack[-1]:
+				if isinstance(item, dict):
+					stack.append(iter(item.values()))
+					break
+				elif isinstance(item, list):
+					yield item
+				else:
+					raise TypeError(f"yaml_walk: unrecognized: {repr(item)}")
 			else:
-				raise TypeError(f"yaml_walk: unrecognized: {repr(item)}")
-		return retval
+				stack.pop()
+
+	def yaml_walk_iter(self, yaml_dict):
+		"""
+		This method will scan a section of loaded YAML and yield all list elements -- the leaf items.
+		"""
+		return chain.from_iterable(self.yaml_leaf_lists(yaml_dict))
+
+	def yaml_walk(self, yaml_dict):
+		"""
+		Like ``yaml_walk_iter()``, but return the leaf items as a list.
+		"""
+		return list(self.yaml_walk_iter(yaml_dict))
 
 	def get_kit_items(self, section="packages"):
 		if section in self.package_data:
 			for package_set in self.package_data[section]:
-				repo_name = list(package_set.keys())[0]
+				repo_name = next(iter(package_set))
 				if section == "packages":
-					# for packages, allow arbitrary nesting, only capturing leaf nodes (catpkgs):
+					# for packages, allow arbitrary nesting, only capturing leaf nodes (catpkgs). The InsertEbuilds step
+					# these feed into requires a list for its select= argument, so this is materialized here:
 					yield repo_name, self.yaml_walk(package_set)
 				else:
 					# not a packages section, and just return the raw YAML subsection for further parsing:
@@ -331,7 +439,7 @@ class AutoGeneratedKit(Kit):
 		"""
 
 		if "mask" in self.eclasses:
-			mask_set = set(list(self.eclasses["mask"]))
+			mask_set = set(self.eclasses["mask"])
 		else:
 			mask_set = set()
 
@@ -387,24 +495,56 @@ class ReleaseYAML(YAMLReader):
 	filename = None
 	remotes = None
 	masters = None
-	all_repo_objs = dict()
+	all_repo_objs = None
 
 	def __init__(self, release=None, prod=False, kit_fixups=None):
 		self.release = release
 		self.kit_fixups = kit_fixups
 		self.mode = "prod" if prod is True else "dev"
+		# SharedSourceRepository objects for this release, shared by its source collections, indexed by repo name:
+		self.all_repo_objs = {}
 		filename = f'{self.kit_fixups.root}/releases/{self.release}/repositories.yaml'
-		if not os.path.exists(filename):
-			raise ConfigurationError(f"Cannot find expected {filename}")
 		self.filename = filename
-		with open(filename, 'r') as f:
-			super().__init__(f)
+		try:
+			super().__init__(data=load_yaml_cached(filename, os.path.join(model.store_path, "yaml_cache")))
+		except FileNotFoundError:
+			raise ConfigurationError(f"Cannot find expected {filename}")
 		self.kits = self._kits()
 		self.remotes = self._remotes()
 
 	def get_default_copyright_rst(self):
 		return self.get_elem("release/copyright")
 
+	async def initialize_all_sources(self):
+		"""
+		Concurrently perform the initial clone/initialization of every source repository used by the kits in the release.
+
+		Kits that share a source repository may each want a different branch/SHA1 of it, and kits are generated one after
+		another, each calling ``initialize_sources()`` to get the sources they need into place. So we can't simply
+		initialize all kits' sources at once. Instead, each distinct repository is initialized once here, using the
+		first kit that references it. Distinct repositories live in distinct git trees, so this is safe to do in
+		parallel, and it leaves ``initialize_sources()`` with at most a checkout to do rather than a full clone.
+		"""
+		repo_inits = []
+		seen = set()
+		for kit_list in self.kits.values():
+			for kit in kit_list:
+				if isinstance(kit, SourcedKit):
+					# All variants of a sourced kit use the same tree:
+					if kit.source.name in seen:
+						continue
+					seen.add(kit.source.name)
+					repo_inits.append(kit.source.initialize())
+				elif isinstance(kit, AutoGeneratedKit):
+					for repo_name in kit.repo_names:
+						if repo_name in seen or repo_name not in kit.source.repo_defs:
+							continue
+						seen.add(repo_name)
+						repo_def = kit.source.repo_defs[repo_name]
+						repo = kit.source.get_repository(repo_name)
+						repo_inits.append(repo.initialize(branch=repo_def.get("branch"), src_sha1=repo_def.get("src_sha1")))
+		await asyncio.gather(*repo_inits)
+
 	def get_release_metadata(self):
 		return self.get_elem("release/metadata")
 
@@ -419,7 +559,7 @@ class ReleaseYAML(YAMLReader):
 			raise ConfigurationError(f"No remotes defined for '{self.mode}' in {self.filename}.")
 		if 'url' not in self.remotes[self.mode]:
 			raise ConfigurationError(f"No URL defined for '{self.mode}' in {self.filename}.")
-		log.debug(f"get_repo_config: self.mode {self.mode} url: {self.remotes[self.mode]}")
+		log.debug("get_repo_config: self.mode %s url: %s", self.mode, self.remotes[self.mode])
 		mirrs = []
 		if 'mirrors' in self.remotes[self.mode]:
 			for mirr in self.remotes[self.mode]['mirrors']:
@@ -438,7 +578,7 @@ class ReleaseYAML(YAMLReader):
 		"""
 		repos = OrderedDict()
 		for yaml_dat in self.iter_list("release/repositories"):
-			name = list(yaml_dat.keys())[0]
+			name = next(iter(yaml_dat))
 			kwargs = yaml_dat[name]
 			repos[name] = kwargs
 		return repos
@@ -473,7 +613,7 @@ class ReleaseYAML(YAMLReader):
 					repo_def = repositories[repo_def]
 				elif isinstance(repo_def, dict):
 					# use pre-defined repository as base and augment with any local tweaks
-					repo_name = list(repo_def.keys())[0]
+					repo_name = next(iter(repo_def))
 					repo_dict = repo_def[repo_name]
 					if repo_name not in repositories:
 						raise KeyError(
@@ -502,13 +642,16 @@ class ReleaseYAML(YAMLReader):
 		if kit_defaults is None:
 			kit_defaults = {}
 		for kit_el in self.iter_list("release/kit-definitions/kits"):
-			kit_insides = kit_defaults.copy()
 			kit_name = None
 			if isinstance(kit_el, str):
 				kit_name = kit_el
+				kit_insides = kit_defaults.copy()
 			elif isinstance(kit_el, dict):
-				kit_name = list(kit_el.keys())[0]
-				kit_insides.update(kit_el[kit_name])
+				kit_name = next(iter(kit_el))
+				# Merge in one step, rather than copying the defaults and then updating the copy:
+				kit_insides = {**kit_defaults, **kit_el[kit_name]}
+			else:
+				kit_insides = kit_defaults.copy()
 
 			# This part of the code handles parsing the YAML, and creating Kit objects, which contain the proper info
 			# within to reference the proper source repositories or source repository (in the case of sourced kits.)
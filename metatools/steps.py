@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import asyncio
 import itertools
 import os
 import re
 import shutil
+from collections import defaultdict
+
 import jinja2
 
 import metatools.cmd
@@ -17,8 +20,80 @@ def run_shell(cmd_list, abort_on_failure=True, chdir=None):
 	return metatools.cmd.run_shell(cmd_list, abort_on_failure=abort_on_failure, chdir=chdir, logger=model.log)
 
 
+def _rmtree_onerror(func, path, exc_info):
+	# Like ``rm -rf``, only tolerate things that have already gone away:
+	if not issubclass(exc_info[0], FileNotFoundError):
+		raise exc_info[1]
+
+
+def remove_path(path):
+	"""
+	In-process equivalent of ``rm -rf path``.
+	"""
+	try:
+		if os.path.isdir(path) and not os.path.islink(path):
+			shutil.rmtree(path, onerror=_rmtree_onerror)
+		else:
+			os.unlink(path)
+	except FileNotFoundError:
+		pass
+
+
+def copy_tree(src, dest):
+	"""
+	In-process equivalent of ``cp -a src/. dest``: copy the directory ``src`` to ``dest``, merging into ``dest`` if it
+	already exists. ``shutil.copytree()`` only learned to do this (``dirs_exist_ok``) in Python 3.8.
+	"""
+	if not os.path.lexists(dest):
+		shutil.copytree(src, dest, symlinks=True)
+		return
+	with os.scandir(src) as entries:
+		for entry in entries:
+			dest_path = os.path.join(dest, entry.name)
+			if entry.is_dir(follow_symlinks=False):
+				copy_tree(entry.path, dest_path)
+			elif entry.is_symlink():
+				if os.path.lexists(dest_path):
+					remove_path(dest_path)
+				os.symlink(os.readlink(entry.path), dest_path)
+			else:
+				shutil.copy2(entry.path, dest_path)
+	shutil.copystat(src, dest)
+
+
+def copy_path(src, dest):
+	"""
+	In-process equivalent of ``cp -a src dest``, for a file, symlink or directory.
+	"""
+	if os.path.isdir(src) and not os.path.islink(src):
+		copy_tree(src, dest)
+	else:
+		shutil.copy2(src, dest, follow_symlinks=False)
+
+
+def copy_pkgdir(pkgdir, tpkgdir, remove_existing=False):
+	"""
+	In-process equivalent of ``rm -rf tpkgdir; cp -a pkgdir tpkgdir``, used to copy a package directory into the
+	destination tree without having to fork any processes.
+	"""
+	if remove_existing:
+		remove_path(tpkgdir)
+	copy_tree(pkgdir, tpkgdir)
+
+
+def copy_pkgdirs(copy_jobs):
+	"""
+	Perform a list of ``(pkgdir, tpkgdir, remove_existing)`` copies, in order, using ``copy_pkgdir()``.
+	"""
+	for pkgdir, tpkgdir, remove_existing in copy_jobs:
+		copy_pkgdir(pkgdir, tpkgdir, remove_existing=remove_existing)
+
+
 class MergeStep:
 
+	# Merge plans create lots of steps, so keep them lightweight -- subclasses define __slots__ too:
+	__slots__ = ()
+
 	# This is only used for Repository Steps:
 	collector = None
 
@@ -27,6 +102,8 @@ class MergeStep:
 
 
 class GenerateLicensingFile(MergeStep):
+	__slots__ = ("text",)
+
 	def __init__(self, text: str):
 		self.text = text
 
@@ -42,27 +119,30 @@ class ThirdPartyMirrors(MergeStep):
 	Add funtoo's distfiles mirror, and add funtoo's mirrors as gentoo backups.
 	"""
 
+	__slots__ = ()
+
 	async def run(self, kit_gen):
 		orig = "%s/profiles/thirdpartymirrors" % kit_gen.out_tree.root
 		new = "%s/profiles/thirdpartymirrors.new" % kit_gen.out_tree.root
 		mirrors = "https://direct.funtoo.org"
-		a = open(orig, "r")
-		b = open(new, "w")
-		for line in a:
-			ls = line.split()
-			if len(ls) and ls[0] == "gentoo":
-				b.write("gentoo\t" + mirrors + " " + " ".join(ls[1:]) + "\n")
-			else:
-				b.write(line)
-		b.write("funtoo %s\n" % mirrors)
-		a.close()
-		b.close()
-		os.unlink(orig)
-		os.link(new, orig)
-		os.unlink(new)
+		out_lines = []
+		with open(orig, "r") as a:
+			for line in a:
+				ls = line.split()
+				if len(ls) and ls[0] == "gentoo":
+					out_lines.append("gentoo\t" + mirrors + " " + " ".join(ls[1:]) + "\n")
+				else:
+					out_lines.append(line)
+		out_lines.append("funtoo %s\n" % mirrors)
+		with open(new, "w") as b:
+			b.writelines(out_lines)
+		# Atomically replace the original -- it never goes missing, even briefly:
+		os.replace(new, orig)
 
 
 class SyncDir(MergeStep):
+	__slots__ = ("src_tree", "srcdir", "destdir", "exclude", "delete")
+
 	def __init__(self, src_tree, srcdir=None, destdir=None, exclude=None, delete=False):
 		self.src_tree = src_tree
 		self.srcdir = srcdir
@@ -94,6 +174,8 @@ class SyncDir(MergeStep):
 
 
 class SyncFromTree(SyncDir):
+	__slots__ = ()
+
 	# sync a full portage tree, deleting any excess files in the target dir:
 	def __init__(self, src_tree, exclude=None, delete=True):
 		if exclude is None:
@@ -107,6 +189,8 @@ class SyncFromTree(SyncDir):
 
 
 class GenerateRepoMetadata(MergeStep):
+	__slots__ = ("name", "aliases", "masters", "priority")
+
 	def __init__(self, name, masters=None, aliases=None, priority=None):
 		self.name = name
 		self.aliases = aliases if aliases is not None else []
@@ -142,6 +226,8 @@ cache-formats = md5-dict
 
 
 class RemoveIfExists(MergeStep):
+	__slots__ = ("files",)
+
 	def __init__(self, files):
 		self.files = files
 
@@ -153,6 +239,8 @@ class RemoveIfExists(MergeStep):
 
 
 class FindAndRemove(MergeStep):
+	__slots__ = ("globs",)
+
 	def __init__(self, globs=None):
 		if globs is None:
 			globs = []
@@ -165,15 +253,18 @@ class FindAndRemove(MergeStep):
 
 
 class RemoveFiles(MergeStep):
+	__slots__ = ("globs",)
+
 	def __init__(self, globs=None):
 		if globs is None:
 			globs = []
 		self.globs = globs
 
 	async def run(self, kit_gen):
-		for glob in self.globs:
-			cmd = "rm -rf %s/%s" % (kit_gen.out_tree.root, glob)
-			await run_shell(cmd)
+		if not self.globs:
+			return
+		# Remove everything with a single rm, letting the shell expand all the globs at once:
+		await run_shell(["rm", "-rf"] + ["%s/%s" % (kit_gen.out_tree.root, glob) for glob in self.globs])
 
 
 class CopyFiles(MergeStep):
@@ -191,6 +282,8 @@ class CopyFiles(MergeStep):
 
 	"""
 
+	__slots__ = ("srctree", "file_map_tuples")
+
 	def __init__(self, srctree, file_map_tuples):
 		if srctree is None:
 			raise ValueError("srctree can't be None")
@@ -212,6 +305,8 @@ class CopyFiles(MergeStep):
 
 
 class CopyAndRename(MergeStep):
+	__slots__ = ("src", "dest", "ren_fun")
+
 	def __init__(self, src, dest, ren_fun):
 		self.src = src
 		self.dest = dest
@@ -220,13 +315,17 @@ class CopyAndRename(MergeStep):
 
 	async def run(self, kit_gen):
 		srcpath = os.path.join(kit_gen.out_tree.root, self.src)
-		for f in os.listdir(srcpath):
-			destfile = os.path.join(kit_gen.out_tree.root, self.dest)
-			destfile = os.path.join(destfile, self.ren_fun(f))
-			await run_shell(f"cp -a {srcpath}/{f} {destfile}")
+		destdir = os.path.join(kit_gen.out_tree.root, self.dest)
+		os.makedirs(destdir, exist_ok=True)
+		with os.scandir(srcpath) as entries:
+			copies = [(entry.path, os.path.join(destdir, self.ren_fun(entry.name))) for entry in entries]
+		loop = asyncio.get_running_loop()
+		await asyncio.gather(*[loop.run_in_executor(None, copy_path, src, dest) for src, dest in copies])
 
 
 class SyncFiles(MergeStep):
+	__slots__ = ("srcroot", "files")
+
 	def __init__(self, srcroot, files):
 		self.srcroot = srcroot
 		self.files = files
@@ -234,6 +333,7 @@ class SyncFiles(MergeStep):
 			raise TypeError("'files' argument should be a dict of source:destination items")
 
 	async def run(self, kit_gen):
+		copies = []
 		for src, dest in self.files.items():
 			if dest is not None:
 				dest = os.path.join(kit_gen.out_tree.root, dest)
@@ -253,12 +353,18 @@ class SyncFiles(MergeStep):
 			if not os.path.exists(dest_dir):
 				os.makedirs(dest_dir)
 			print("copying %s to final location %s" % (src, dest))
-			shutil.copyfile(src, dest)
+			copies.append((src, dest))
+		# Destination directories have all been prepared above, so the copies themselves can run in parallel. On Linux,
+		# shutil.copyfile() uses os.sendfile() so the data is copied in-kernel:
+		loop = asyncio.get_running_loop()
+		await asyncio.gather(*[loop.run_in_executor(None, shutil.copyfile, src, dest) for src, dest in copies])
 
 
 class CleanTree(MergeStep):
 	# remove all files from tree, except dotfiles/dirs.
 
+	__slots__ = ("exclude",)
+
 	def __init__(self, exclude=None):
 		if exclude is None:
 			exclude = []
@@ -276,6 +382,8 @@ class CleanTree(MergeStep):
 
 
 class ELTSymlinkWorkaround(MergeStep):
+	__slots__ = ()
+
 	async def run(self, kit_gen):
 		dest = os.path.join(kit_gen.out_tree.root + "/eclass/ELT-patches")
 		if not os.path.lexists(dest):
@@ -285,7 +393,22 @@ class ELTSymlinkWorkaround(MergeStep):
 regextype = type(re.compile("hello, world"))
 
 
+def get_catpkg_matcher(spec):
+	"""
+	Given a ``select``/``skip``-style specification (a list of catpkgs or a compiled regex), return a function that
+	accepts a catpkg and returns whether it matches. None is returned for anything else (such as "all" or None), which
+	means the specification doesn't restrict anything.
+	"""
+	if isinstance(spec, list):
+		return frozenset(spec).__contains__
+	elif isinstance(spec, regextype):
+		return spec.match
+	return None
+
+
 class InsertFilesFromSubdir(MergeStep):
+	__slots__ = ("subdir", "suffixfilter", "select", "srctree", "skip", "src_offset")
+
 	def __init__(self, srctree, subdir, suffixfilter=None, select="all", skip=None, src_offset=""):
 		self.subdir = subdir
 		self.suffixfilter = suffixfilter
@@ -301,28 +424,24 @@ class InsertFilesFromSubdir(MergeStep):
 			src = os.path.join(src, self.src_offset)
 		if self.subdir:
 			src = os.path.join(src, self.subdir)
-		if not os.path.exists(src):
+		try:
+			with os.scandir(src) as it:
+				entries = [entry.name for entry in it]
+		except FileNotFoundError:
 			return
 		dst = kit_gen.out_tree.root
 		if self.subdir:
 			dst = os.path.join(dst, self.subdir)
-		if not os.path.exists(dst):
-			os.makedirs(dst)
-		for e in os.listdir(src):
+		os.makedirs(dst, exist_ok=True)
+		select_fn = get_catpkg_matcher(self.select)
+		skip_fn = get_catpkg_matcher(self.skip)
+		for e in entries:
 			if self.suffixfilter and not e.endswith(self.suffixfilter):
 				continue
-			if isinstance(self.select, list):
-				if e not in self.select:
-					continue
-			elif isinstance(self.select, regextype):
-				if not self.select.match(e):
-					continue
-			if isinstance(self.skip, list):
-				if e in self.skip:
-					continue
-			elif isinstance(self.skip, regextype):
-				if self.skip.match(e):
-					continue
+			if select_fn is not None and not select_fn(e):
+				continue
+			if skip_fn is not None and skip_fn(e):
+				continue
 			await run_shell("cp -a %s/%s %s" % (src, e, dst))
 
 
@@ -335,6 +454,8 @@ class PruneLicenses(MergeStep):
 
 	"""
 
+	__slots__ = ()
+
 	def get_all_licenses(self, kit_gen):
 		used_licenses = set()
 		for key, datums in kit_gen.kit_cache.items():
@@ -355,14 +476,14 @@ class PruneLicenses(MergeStep):
 
 
 class CreateCategories(MergeStep):
+	__slots__ = ()
+
 	async def run(self, kit_gen):
 		catset = set()
-		for maybe_cat in os.listdir(kit_gen.out_tree.root):
-			full_path = os.path.join(kit_gen.out_tree.root, maybe_cat)
-			if not os.path.isdir(full_path):
-				continue
-			if "-" in maybe_cat or maybe_cat == "virtual":
-				catset.add(maybe_cat)
+		with os.scandir(kit_gen.out_tree.root) as entries:
+			for entry in entries:
+				if ("-" in entry.name or entry.name == "virtual") and entry.is_dir():
+					catset.add(entry.name)
 		if not os.path.exists(kit_gen.out_tree.root + "/profiles"):
 			os.makedirs(kit_gen.out_tree.root + "/profiles")
 		with open(kit_gen.out_tree.root + "/profiles/categories", "w") as g:
@@ -371,6 +492,8 @@ class CreateCategories(MergeStep):
 
 
 class ZapMatchingEbuilds(MergeStep):
+	__slots__ = ("select", "srctree", "branch")
+
 	def __init__(self, srctree, select="all", branch=None):
 		self.select = select
 		self.srctree = srctree
@@ -390,21 +513,29 @@ class ZapMatchingEbuilds(MergeStep):
 
 		# Our main loop:
 		print("# Zapping builds from %s" % kit_gen.out_tree.root)
+		zap_list = []
 		for cat in os.listdir(kit_gen.out_tree.root):
 			if cat not in dest_cat_set:
 				continue
 			src_catdir = os.path.join(self.srctree.root, cat)
-			if not os.path.isdir(src_catdir):
+			try:
+				with os.scandir(src_catdir) as entries:
+					src_pkgs = [entry.name for entry in entries]
+			except (FileNotFoundError, NotADirectoryError):
 				continue
-			for src_pkg in os.listdir(src_catdir):
+			for src_pkg in src_pkgs:
 				dest_pkgdir = os.path.join(kit_gen.out_tree.root, cat, src_pkg)
 				if not os.path.exists(dest_pkgdir):
 					# don't need to zap as it doesn't exist
 					continue
-				await run_shell("rm -rf %s" % dest_pkgdir)
+				zap_list.append(dest_pkgdir)
+		# Package directories are independent of one another, so remove them in parallel:
+		loop = asyncio.get_running_loop()
+		await asyncio.gather(*[loop.run_in_executor(None, remove_path, dest_pkgdir) for dest_pkgdir in zap_list])
 
 
 class Autogen(MergeStep):
+	__slots__ = ("srctree", "ebuildloc", "scope")
 
 	def __init__(self, srctree, ebuildloc=None, scope=None):
 		self.srctree = srctree
@@ -446,6 +577,11 @@ class InsertEbuilds(MergeStep):
 
 	"""
 
+	__slots__ = (
+		"select", "skip", "srctree", "replace", "categories", "skip_duplicates", "move_maps", "select_only", "ebuildloc",
+		"select_only_set", "select_fn", "skip_fn"
+	)
+
 	def __init__(
 		self,
 		srctree,
@@ -473,13 +609,17 @@ class InsertEbuilds(MergeStep):
 		else:
 			self.select_only = select_only
 		self.ebuildloc = ebuildloc
+		# Work out how to match catpkgs once, rather than for every catpkg we process:
+		self.select_only_set = None if self.select_only == "all" else frozenset(self.select_only)
+		self.select_fn = get_catpkg_matcher(self.select)
+		self.skip_fn = get_catpkg_matcher(self.skip)
 
 	def __repr__(self):
 		return "<InsertEbuilds: %s>" % self.srctree.root
 
 	async def run(self, kit_gen):
 
-		script_out = ""
+		copy_jobs = []
 		checks = []
 
 		if self.ebuildloc:
@@ -490,7 +630,6 @@ class InsertEbuilds(MergeStep):
 		kit_gen.out_tree.log_tree(self.srctree)
 		# Figure out what categories to process:
 		src_cat_path = os.path.join(srctree_root, "profiles/categories")
-		dest_cat_path = os.path.join(kit_gen.out_tree.root, "profiles/categories")
 		if self.categories is not None:
 			# categories specified in __init__:
 			src_cat_set = set(self.categories)
@@ -501,17 +640,11 @@ class InsertEbuilds(MergeStep):
 				with open(src_cat_path, "r") as f:
 					src_cat_set.update(f.read().splitlines())
 			# auto-detect additional categories:
-			cats = os.listdir(srctree_root)
-			for cat in cats:
-				# All categories have a "-" in them and are directories:
-				if os.path.isdir(os.path.join(srctree_root, cat)):
-					if "-" in cat or cat == "virtual":
-						src_cat_set.add(cat)
-		if os.path.exists(dest_cat_path):
-			with open(dest_cat_path, "r") as f:
-				dest_cat_set = set(f.read().splitlines())
-		else:
-			dest_cat_set = set()
+			with os.scandir(srctree_root) as entries:
+				for entry in entries:
+					# All categories have a "-" in them and are directories:
+					if ("-" in entry.name or entry.name == "virtual") and entry.is_dir():
+						src_cat_set.add(entry.name)
 		# Our main loop:
 		model.log.info(f"Merging in ebuilds from {srctree_root}")
 		for cat in src_cat_set:
@@ -520,32 +653,23 @@ class InsertEbuilds(MergeStep):
 				# not a valid category in source overlay, so skip it
 				continue
 			# runShell("install -d %s" % catdir)
-			for pkg in os.listdir(catdir):
-				catpkg = "%s/%s" % (cat, pkg)
-				pkgdir = os.path.join(catdir, pkg)
-				if self.select_only != "all" and catpkg not in self.select_only:
+			with os.scandir(catdir) as entries:
+				pkg_entries = list(entries)
+			for pkg_entry in pkg_entries:
+				catpkg = "%s/%s" % (cat, pkg_entry.name)
+				pkgdir = pkg_entry.path
+				if self.select_only_set is not None and catpkg not in self.select_only_set:
 					# we don't want this catpkg
 					continue
-				if not os.path.isdir(pkgdir):
+				if not pkg_entry.is_dir():
 					# not a valid package dir in source overlay, so skip it
 					continue
-				if isinstance(self.select, list):
-					if catpkg not in self.select:
-						# we have a list of pkgs to merge, and this isn't on the list, so skip:
-						continue
-				elif isinstance(self.select, regextype):
-					if not self.select.match(catpkg):
-						# no regex match:
-						continue
-				if isinstance(self.skip, list):
-					if catpkg in self.skip:
-						# we have a list of pkgs to skip, and this catpkg is on the list, so skip:
-						continue
-				elif isinstance(self.skip, regextype):
-					if self.select.match(catpkg):
-						# regex skip match, continue
-						continue
-				dest_cat_set.add(cat)
+				if self.select_fn is not None and not self.select_fn(catpkg):
+					# we have a list or regex of pkgs to merge, and this doesn't match, so skip:
+					continue
+				if self.skip_fn is not None and self.skip_fn(catpkg):
+					# we have a list or regex of pkgs to skip, and this catpkg matches, so skip:
+					continue
 				tpkgdir = None
 				tcatpkg = None
 				if catpkg in self.move_maps:
@@ -566,9 +690,7 @@ class InsertEbuilds(MergeStep):
 				if self.replace is True or (isinstance(self.replace, list) and (catpkg in self.replace)):
 					if not os.path.exists(tcatdir):
 						os.makedirs(tcatdir)
-					if os.path.exists(tpkgdir):
-						script_out += f"/bin/rm -rf '{tpkgdir}' \n"
-					script_out += f"/bin/cp -a '{pkgdir}' '{tpkgdir}'\n"
+					copy_jobs.append((pkgdir, tpkgdir, os.path.exists(tpkgdir)))
 					checks.append(tpkgdir)
 					copied = True
 				else:
@@ -577,22 +699,19 @@ class InsertEbuilds(MergeStep):
 					if not os.path.exists(tcatdir):
 						os.makedirs(tcatdir)
 					if not os.path.exists(tpkgdir):
-						script_out += f"/bin/cp -a '{pkgdir}' '{tpkgdir}'\n"
+						copy_jobs.append((pkgdir, tpkgdir, False))
 						checks.append(tpkgdir)
 				if copied:
 					# log XML here.
 					pass
-		if script_out:
-			temp_out = os.path.join(model.temp_path, kit_gen.out_tree.name + "_copyfiles.sh")
-			os.makedirs(os.path.dirname(temp_out), exist_ok=True)
-			#sys.stdout.write(f"Written to {temp_out}:\n")
-			#sys.stdout.write(script_out)
-			#sys.stdout.write("\n")
-			with open(temp_out, "w") as f:
-				f.write("#!/bin/bash\n")
-				f.write(script_out)
-			await run_shell(f"/bin/bash {temp_out}")
-			os.unlink(temp_out)
+		if copy_jobs:
+			# Package directories are independent of one another, so copy them in parallel. Any jobs that target the
+			# same destination (possible with move_maps) are kept together so they still run in order:
+			jobs_by_dest = defaultdict(list)
+			for job in copy_jobs:
+				jobs_by_dest[job[1]].append(job)
+			loop = asyncio.get_running_loop()
+			await asyncio.gather(*[loop.run_in_executor(None, copy_pkgdirs, jobs) for jobs in jobs_by_dest.values()])
 		for check in checks:
 			if not os.path.exists(check):
 				raise FileNotFoundError(
@@ -603,17 +722,21 @@ class InsertEbuilds(MergeStep):
 class ProfileDepFix(MergeStep):
 	"""ProfileDepFix undeprecates profiles marked as deprecated."""
 
+	__slots__ = ()
+
 	async def run(self, kit_gen):
 		fpath = os.path.join(kit_gen.out_tree.root, "profiles/profiles.desc")
 		if os.path.exists(fpath):
-			a = open(fpath, "r")
-			for line in a:
-				if line[0:1] == "#":
-					continue
-				sp = line.split()
-				if len(sp) >= 2:
-					prof_path = sp[1]
-					await run_shell("rm -f %s/profiles/%s/deprecated" % (kit_gen.out_tree.root, prof_path))
+			with open(fpath, "r") as a:
+				for line in a:
+					if line[0:1] == "#":
+						continue
+					sp = line.split()
+					if len(sp) >= 2:
+						prof_path = sp[1]
+						deprecated_path = os.path.join(kit_gen.out_tree.root, "profiles", prof_path, "deprecated")
+						if os.path.lexists(deprecated_path):
+							os.unlink(deprecated_path)
 
 
 class RunSed(MergeStep):
@@ -625,6 +748,8 @@ class RunSed(MergeStep):
 	commands: List of commands.
 	"""
 
+	__slots__ = ("files", "commands")
+
 	def __init__(self, files, commands):
 		self.files = files
 		self.commands = commands
@@ -638,12 +763,33 @@ class RunSed(MergeStep):
 class Minify(MergeStep):
 	"""Minify removes ChangeLogs and shrinks Manifests."""
 
+	__slots__ = ()
+
+	@staticmethod
+	def minify_tree(root):
+		for dirpath, dirnames, filenames in os.walk(root):
+			if ".git" in dirnames:
+				dirnames.remove(".git")
+			for filename in filenames:
+				lower_filename = filename.lower()
+				path = os.path.join(dirpath, filename)
+				if lower_filename == "changelog":
+					os.unlink(path)
+				elif lower_filename == "manifest":
+					with open(path, "rb") as f:
+						lines = f.readlines()
+					dist_lines = [line for line in lines if line.startswith(b"DIST")]
+					if len(dist_lines) != len(lines):
+						with open(path, "wb") as f:
+							f.writelines(dist_lines)
+
 	async def run(self, kit_gen):
-		await run_shell("( cd %s && find -iname ChangeLog | xargs rm -f )" % kit_gen.out_tree.root, abort_on_failure=False)
-		await run_shell("( cd %s && find -iname Manifest | xargs -i@ sed -ni '/^DIST/p' @ )" % kit_gen.out_tree.root)
+		await asyncio.get_running_loop().run_in_executor(None, self.minify_tree, kit_gen.out_tree.root)
 
 
 class GenPythonUse(MergeStep):
+	__slots__ = ("def_python", "bk_python", "mask", "out_subpath")
+
 	def __init__(self):
 		kit = model.release_yaml.kits["python-kit"][0]
 		pydata = kit.settings
@@ -260,7 +260,6 @@ class FileStorageBackend(StorageBackend):
 		sha = self.store.key_spec.data_as_hash(data)
 		dir_index = f"{sha[0:2]}/{sha[2:4]}/{sha[4:6]}"
 		out_path = f"{self.root}/{dir_index}/{sha}"
-		os.makedirs(os.path.dirname(out_path), exist_ok=True)
 		return self._write_phase2(out_path, data, blob_path)
 
 	def _write_phase2(self, out_path, data, blob_path=None) -> Optional[StoreObject]:
@@ -269,8 +268,10 @@ class FileStorageBackend(StorageBackend):
 			f.write(self.encode_data(data))
 		if blob_path:
 			blob_outpath = out_path + ".blob"
-			if os.path.exists(blob_outpath):
+			try:
 				os.unlink(blob_outpath)
+			except FileNotFoundError:
+				pass
 			# Downloading two different URLs which point to the exact same binary can result in races. This happens with
 			# crates:
 			#
@@ -293,11 +294,11 @@ class FileStorageBackend(StorageBackend):
 		sha = self.store.key_spec.specdict_as_hash(spec_dict)
 		dir_index = f"{sha[0:2]}/{sha[2:4]}/{sha[4:6]}"
 		in_path = f"{self.root}/{dir_index}/{sha}"
-		if not os.path.exists(in_path):
-			return None
 		blob_path = in_path + ".blob"
 		try:
 			data = self.decode_data(in_path)
+		except FileNotFoundError:
+			return None
 		except json.decoder.JSONDecodeError as je:
 			return None
 		return StoreObject(data=data, blob_path=blob_path if os.path.exists(blob_path) else None, json_path=in_path)
@@ -306,11 +307,11 @@ class FileStorageBackend(StorageBackend):
 		sha = self.store.key_spec.specdict_as_hash(spec_dict)
 		dir_index = f"{sha[0:2]}/{sha[2:4]}/{sha[4:6]}"
 		in_path = f"{self.root}/{dir_index}/{sha}"
-		if os.path.exists(in_path):
-			os.unlink(in_path)
-		blob_path = in_path + ".blob"
-		if os.path.exists(blob_path):
-			os.unlink(blob_path)
+		for path in (in_path, in_path + ".blob"):
+			try:
+				os.unlink(path)
+			except FileNotFoundError:
+				pass
 
 	def get_relative_path_to_root(self, disk_path):
 		common = os.path.commonpath([self.root, disk_path])
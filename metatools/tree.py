@@ -1,20 +1,96 @@
-import glob
 import logging
 import os
 import subprocess
+import time
 
-from metatools.cmd import capture_bg, run_bg, ShellError, run_shell
+from metatools.cmd import capture_exec, run_bg, run_bg_exec, run_exec, ShellError, run_shell
+
+
+def git_query(root, *args):
+	"""
+	Run ``git`` with ``args`` in ``root``, without a shell, and return a tuple of its return code and its stripped
+	stdout. A missing ``root`` is reported as a failed command.
+	"""
+	try:
+		proc = subprocess.run(["git", *args], cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+	except OSError:
+		return 1, ""
+	return proc.returncode, proc.stdout.strip()
 
 
 def head_sha1(tree):
-	retval, out = subprocess.getstatusoutput("(cd %s && git rev-parse HEAD)" % tree)
+	retval, out = git_query(tree, "rev-parse", "HEAD")
 	if retval == 0:
-		return out.strip()
+		return out
 	return None
 
 
+class GitBatch:
+	"""
+	A long-running ``git cat-file --batch-check`` process for a git tree. This allows us to resolve refs like ``HEAD``
+	and local/remote branches without forking a new git process for every query. git re-reads refs on every lookup, so
+	answers stay correct as the tree is checked out, committed to, and pulled.
+	"""
+
+	def __init__(self, root):
+		self.root = root
+		self.proc = None
+
+	def start(self):
+		self.proc = subprocess.Popen(
+			["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+			cwd=self.root,
+			stdin=subprocess.PIPE,
+			stdout=subprocess.PIPE,
+			stderr=subprocess.DEVNULL,
+			text=True,
+			bufsize=1,
+		)
+
+	def resolve(self, ref):
+		"""
+		Return the SHA1 of the object ``ref`` points to, or None if it doesn't exist. Raises OSError if a batch process
+		can't be started or dies (for example, if the tree isn't a git repository yet.)
+		"""
+		if self.proc is None or self.proc.poll() is not None:
+			self.start()
+		try:
+			self.proc.stdin.write(ref + "\n")
+			self.proc.stdin.flush()
+			line = self.proc.stdout.readline()
+		except OSError:
+			self.close()
+			raise
+		if not line:
+			self.close()
+			raise OSError(f"git cat-file exited unexpectedly in {self.root}")
+		fields = line.split()
+		if len(fields) != 2 or fields[1] in ("missing", "ambiguous"):
+			return None
+		return fields[0]
+
+	def close(self):
+		if self.proc is None:
+			return
+		proc, self.proc = self.proc, None
+		try:
+			proc.stdin.close()
+			proc.wait(timeout=5)
+		except (OSError, subprocess.TimeoutExpired):
+			proc.kill()
+			proc.wait()
+		proc.stdout.close()
+
+	def __del__(self):
+		self.close()
+
+
 class Tree:
 
+	# Resolved refs and current branch, keyed by tree root. This is shared by all Tree objects pointing at the same
+	# repository, and is cleared for a root whenever we run a command there that may move refs or HEAD.
+	ref_cache = {}
+
 	def __init__(self, root=None, model=None):
 		self.root = root
 		self.autogenned = False
@@ -25,6 +101,7 @@ class Tree:
 		self.model = model
 		self.initialized = False
 		self.branch = None
+		self._git_batch = None
 		if self.model:
 			self.log = self.model.log
 		else:
@@ -38,6 +115,42 @@ class Tree:
 	async def _initialize_tree(self):
 		self.initialized = True
 
+	def invalidate_refs(self):
+		Tree.ref_cache.pop(self.root, None)
+
+	def resolve_ref(self, ref):
+		"""
+		Return the SHA1 that ``ref`` resolves to in this tree, or None if it doesn't exist. Results are cached in
+		``ref_cache`` until the next command is run in the tree.
+		"""
+		refs = Tree.ref_cache.setdefault(self.root, {})
+		if ref not in refs:
+			refs[ref] = self._resolve_ref(ref)
+		return refs[ref]
+
+	def _resolve_ref(self, ref):
+		"""
+		Resolve ``ref`` using a persistent ``GitBatch`` process, falling back to a one-shot ``git rev-parse`` if one
+		can't be started.
+		"""
+		if self._git_batch is None:
+			self._git_batch = GitBatch(self.root)
+		elif self._git_batch.root != self.root:
+			self._git_batch.close()
+			self._git_batch = GitBatch(self.root)
+		try:
+			return self._git_batch.resolve(ref)
+		except OSError:
+			retval, out = git_query(self.root, "rev-parse", "--verify", "--quiet", ref)
+			if retval == 0:
+				return out
+			return None
+
+	def close(self):
+		if self._git_batch is not None:
+			self._git_batch.close()
+			self._git_batch = None
+
 	def find_license(self, license):
 		lic_path = f"{self.root}/licenses/{license}"
 		if os.path.exists(lic_path):
@@ -46,7 +159,19 @@ class Tree:
 			raise FileNotFoundError(lic_path)
 
 	async def run_shell(self, cmd_list, abort_on_failure=True, chdir=None):
-		return await run_shell(cmd_list, abort_on_failure=abort_on_failure, chdir=chdir, logger=self.log)
+		try:
+			return await run_shell(cmd_list, abort_on_failure=abort_on_failure, chdir=chdir, logger=self.log)
+		finally:
+			self.invalidate_refs()
+
+	async def run_git(self, *args, abort_on_failure=True, cwd=None):
+		"""
+		Run ``git`` with ``args`` in this tree (or ``cwd``, if specified) without an intermediate shell.
+		"""
+		try:
+			return await run_exec(["git", *args], abort_on_failure=abort_on_failure, cwd=cwd or self.root, logger=self.log)
+		finally:
+			self.invalidate_refs()
 
 	def log_tree(self, srctree):
 		# record name and SHA of src tree in dest tree, used for git commit message/auditing:
@@ -73,14 +198,16 @@ class Tree:
 		if scope is None:
 			scope = "local"
 		self.log.debug(f"Final scope: {scope}")
-		cmd_str = f"cd {autogen_path} && doit --fast --release {self.model.release} --fastpull_scope={scope} --moonbeam"
+		cmd_argv = ["doit", "--fast", "--release", str(self.model.release), f"--fastpull_scope={scope}", "--moonbeam"]
 		if self.model.debug:
-			cmd_str += " --debug"
-			self.log.debug(cmd_str)
+			cmd_argv.append("--debug")
 		if self.model.prod:
-			cmd_str += " --prod"
+			cmd_argv.append("--prod")
+		cmd_str = " ".join(cmd_argv)
+		if self.model.debug:
+			self.log.debug(f"{cmd_str} (in {autogen_path})")
 		# We must fork and run this async, so we can receive moonbeam messages while this is running:
-		retcode = await run_bg(cmd_str)
+		retcode = await run_bg_exec(cmd_argv, cwd=autogen_path)
 		# use subprocess.call so we can see the output of autogen:
 		# TODO: we don't need to see this GitTreeError traceback
 		if retcode != 0:
@@ -90,32 +217,46 @@ class Tree:
 
 	async def clean_tree(self):
 		self.log.debug("Cleaning tree %s" % self.root)
-		await self.run_shell(f"(cd {self.root} && git reset --hard && git clean -fdx )")
+		await self.run_git("reset", "--hard")
+		await self.run_git("clean", "-fdx")
 		self.autogenned = False
 
 	def get_depth_of_commit(self, sha1):
-		s, depth = subprocess.getstatusoutput("( cd %s && git rev-list HEAD ^%s --count)" % (self.root, sha1))
+		s, depth = git_query(self.root, "rev-list", "HEAD", f"^{sha1}", "--count")
 		return int(depth) + 1
 
 	def local_branch_exists(self, branch):
-		s, branch = subprocess.getstatusoutput(
-			"( cd %s && git show-ref --verify --quiet refs/heads/%s )" % (self.root, branch)
-		)
-		if s:
-			return False
-		else:
-			return True
+		return self.resolve_ref(f"refs/heads/{branch}") is not None
 
 	def head(self):
-		return head_sha1(self.root)
+		return self.resolve_ref("HEAD")
 
 	@property
 	def current_local_branch(self):
-		s, branch = subprocess.getstatusoutput("( cd %s && git symbolic-ref --short -q HEAD )" % self.root)
-		if s:
-			return None
-		else:
-			return branch
+		refs = Tree.ref_cache.setdefault(self.root, {})
+		if ("symbolic-ref", "HEAD") not in refs:
+			refs[("symbolic-ref", "HEAD")] = self._read_current_branch()
+		return refs[("symbolic-ref", "HEAD")]
+
+	def _read_current_branch(self):
+		"""
+		Return the short name of the checked-out branch, or None if HEAD is detached. This is the one ref query our
+		``GitBatch`` process can't answer, so rather than spawning ``git symbolic-ref`` we read ``.git/HEAD`` directly,
+		and only fall back to git for unusual layouts (worktrees, HEAD pointing outside of refs/heads, etc.)
+		"""
+		try:
+			with open(os.path.join(self.root, ".git", "HEAD"), "r") as f:
+				head = f.read().strip()
+		except OSError:
+			head = None
+		if head is not None:
+			if head.startswith("ref: refs/heads/"):
+				return head[len("ref: refs/heads/"):]
+			elif not head.startswith("ref: "):
+				# detached HEAD
+				return None
+		s, branch = git_query(self.root, "symbolic-ref", "--short", "-q", "HEAD")
+		return None if s else branch
 
 	async def git_checkout(self, branch=None, from_init=False):
 		if not from_init:
@@ -123,7 +264,7 @@ class Tree:
 		await self.clean_tree()
 		if self.current_local_branch != branch:
 			if self.local_branch_exists(branch):
-				await self.run_shell("(cd %s && git checkout %s)" % (self.root, branch))
+				await self.run_git("checkout", branch)
 			else:
 				raise GitTreeError(f"Local branch {branch} does not exist but I was asked to checkout this branch.")
 		if self.current_local_branch != branch:
@@ -131,29 +272,28 @@ class Tree:
 		self.branch = branch
 
 	async def git_add(self, skip=None):
-		if skip is None:
-			skip = []
-		skip.append(".git")
-		files = ""
-		for x in os.listdir(self.root):
-			if x not in skip:
-				files += " '" + x + "'"
+		if not skip:
+			# Nothing to leave out, so let git find everything itself rather than listing the top-level entries:
+			await self.run_git("add", "-A")
+			return
+		skip = set(skip)
+		skip.add(".git")
+		files = [x for x in os.listdir(self.root) if x not in skip]
 		if files:
-			await self.run_shell(f"cd {self.root} && git add {files[1:]}")
+			await self.run_git("add", "--", *files)
 
 	async def git_commit(self, message="", skip=None, push=True):
 		await self.git_add(skip=skip)
 		cmd = '( cd %s && [ -n "$(git status --porcelain)" ] && git commit -a -F - << EOF\n' % self.root
 		if message != "":
 			cmd += "%s\n\n" % message
-		names = []
-		if len(self.merged):
+		# don't print dups -- the first SHA1 recorded for each name wins:
+		merged = {}
+		for name, sha1 in self.merged:
+			merged.setdefault(name, sha1)
+		if merged:
 			cmd += "merged: \n\n"
-			for name, sha1 in self.merged:
-				if name in names:
-					# don't print dups
-					continue
-				names.append(name)
+			for name, sha1 in merged.items():
 				if sha1 is not None:
 					cmd += "  %s: %s\n" % (name, sha1)
 		cmd += "EOF\n"
@@ -165,6 +305,7 @@ class Tree:
 			# In particular, a new tmux window will have HOME set to /root but NOT exported. Which will mess git up. (It won't know where to find ~/.gitconfig.)
 			myenv["HOME"] = "/root"
 		retval = await run_bg(cmd, env=myenv)
+		self.invalidate_refs()
 		if retval not in [0, 1]:  # can return 1
 			print("Commit failed.")
 			raise ShellError("Aborting due to failed command.")
@@ -173,7 +314,7 @@ class Tree:
 
 	async def mirror_local_branches(self):
 		# This is a special push command that will push local tags and branches *only*
-		await self.run_shell(f"(cd {self.root} && git push {self.forcepush} {self.url} +refs/heads/* +refs/tags/*)")
+		await self.run_git("push", self.forcepush, self.url, "+refs/heads/*", "+refs/tags/*")
 
 
 class GitTreeError(Exception):
@@ -196,14 +337,18 @@ class AutoCreatedGitTree(Tree):
 		self.merged = []
 
 	async def _create_branch(self):
-		await run_shell(f"git checkout master; git checkout -b {self.branch}", chdir=self.root)
+		await self.run_shell(f"git checkout master; git checkout -b {self.branch}", chdir=self.root)
 
 	async def _initialize_tree(self):
 		if not os.path.exists(self.root):
 			os.makedirs(self.root)
-			await self.run_shell("( cd %s && git init )" % self.root)
-			await self.run_shell("echo 'created by merge-kits.' > %s/README" % self.root)
-			await self.run_shell("( cd %s &&	git add README; git commit -a -m 'initial commit by merge-kits' )" % self.root)
+			cmds = [
+				"git init",
+				"echo 'created by merge-kits.' > README",
+				"git add README",
+				"git commit -a -m 'initial commit by merge-kits'",
+			]
+			await self.run_shell(f"( cd {self.root} && " + " && ".join(cmds) + " )")
 
 		if not self.local_branch_exists(self.branch):
 			await self._create_branch()
@@ -214,7 +359,7 @@ class AutoCreatedGitTree(Tree):
 		# point to specified sha1:
 
 		if self.commit_sha1:
-			await self.run_shell("(cd %s && git checkout %s )" % (self.root, self.commit_sha1))
+			await self.run_git("checkout", self.commit_sha1)
 			if self.head() != self.commit_sha1:
 				raise GitTreeError("%s: Was not able to check out specified SHA1: %s." % (self.root, self.commit_sha1))
 			if self.current_local_branch != self.branch:
@@ -227,6 +372,11 @@ class GitTree(Tree):
 		A Tree (git) that we can use as a source for work jobs, and/or a target for running jobs.
 	"""
 
+	# Time of the last successful 'git fetch', by tree root. Merging re-enters the same repositories many times, and
+	# there is no need to hit the network again if we fetched within the last ``fetch_ttl`` seconds.
+	last_fetch = {}
+	fetch_ttl = 60
+
 	def __init__(
 			self,
 			name: str,
@@ -248,6 +398,9 @@ class GitTree(Tree):
 			reclone: bool = False,
 			pull: bool = True,
 			checkout_all_branches: bool = False,
+			# Passed to 'git clone --filter=' on initial clone, e.g. "blob:none" for a partial clone that fetches file
+			# contents only as they are needed (by checkouts) rather than for all of history up-front.
+			clone_filter: str = None,
 			model=None
 	):
 
@@ -269,6 +422,7 @@ class GitTree(Tree):
 		self.forcepush = "--force" if forcepush else "--no-force"
 		self.commit_sha1 = commit_sha1
 		self.checkout_all_branches = checkout_all_branches
+		self.clone_filter = clone_filter
 		self.keep_branch = keep_branch
 		if not self.keep_branch and branch is None:
 			self.branch = "master"
@@ -277,13 +431,15 @@ class GitTree(Tree):
 		self.log.debug(f"GitTree(): {self.name} {self.url} {self.branch} {self.commit_sha1}")
 
 	async def _create_branches(self):
-		await self.run_shell(f"git checkout master; git checkout -b {self.branch}", chdir=self.root)
-		await self.run_shell(f"git push --set-upstream origin {self.branch}", chdir=self.root)
+		await self.run_shell(
+			f"git checkout master; git checkout -b {self.branch} && git push --set-upstream origin {self.branch}",
+			chdir=self.root
+		)
 
 	# if we don't specify root destination tree, assume we are source only:
 
 	async def has_local_changes(self):
-		proc, out = await capture_bg(f"(cd {self.root} && git status --porcelain)")
+		proc, out = await capture_exec(["git", "status", "--porcelain"], cwd=self.root)
 		out = out.strip()
 		return len(out) > 0
 
@@ -292,19 +448,28 @@ class GitTree(Tree):
 			base = self.model.source_trees
 			self.root = "%s/%s" % (base, self.name)
 
-		if os.path.isdir("%s/.git" % self.root) and self.reclone:
+		# stat .git only once -- on network filesystems, each stat can be expensive:
+		has_dotgit = os.path.isdir("%s/.git" % self.root)
+
+		if has_dotgit and self.reclone:
+			self.close()
+			GitTree.last_fetch.pop(self.root, None)
 			await self.run_shell("rm -rf %s" % self.root)
+			has_dotgit = False
 
-		if not os.path.isdir("%s/.git" % self.root):
+		if not has_dotgit:
 			if os.path.exists(self.root):
 				raise GitTreeError("%s exists but does not appear to be a valid git repository." % self.root)
 
 			base = os.path.dirname(self.root)
 			if self.url:
-				if not os.path.exists(base):
-					os.makedirs(base)
+				os.makedirs(base, exist_ok=True)
 				# we aren't supposed to create it from scratch -- can we clone it?
-				await self.run_shell("(cd %s && git clone %s %s)" % (base, self.url, os.path.basename(self.root)))
+				clone_args = [f"--filter={self.clone_filter}"] if self.clone_filter else []
+				await self.run_git("clone", *clone_args, self.url, os.path.basename(self.root), cwd=base)
+				# A fresh clone is as up-to-date as it gets, so don't pull again while initializing. We deliberately don't
+				# record this as a fetch, though -- later checkouts of other branches/SHA1s may still need to fetch:
+				self.pulled = True
 
 			else:
 				# we've run out of options
@@ -322,24 +487,28 @@ class GitTree(Tree):
 		# for mirroring purposes and there may be many bugfix branches:
 		if self.checkout_all_branches:
 			# We should also, for the sake of mirroring working, create all local branches for remote branches.
-			proc, stdout = await capture_bg(f"(cd {self.root} && git branch -r | grep -v /HEAD)")
-			if proc.returncode != 0:
+			proc, stdout = await capture_exec(
+				["git", "for-each-ref", "--format=%(refname:lstrip=3)", "refs/remotes/origin/"], cwd=self.root
+			)
+			remote_branches = [branch for branch in stdout.split() if branch != "HEAD"]
+			if proc.returncode != 0 or not remote_branches:
 				# This will happen if, for example, meta-repo is an AutoGeneratedGitTree, and then it is referenced
 				# as a regular GitTree by deepdive. It will have no remotes.
 				init_branches.append(self.branch)
-			else:
-				for branch in stdout.split():
-					init_branches.append("/".join(branch.split("/")[1:]))
-				if self.branch not in init_branches:
-					if self.create_branches:
-						await self._create_branches()
-						init_branches = [self.branch]
-					else:
-						raise ShellError(f"Could not find remote branch: {self.branch} in git tree {self.root}.")
-				# Put the branch we want at the end, so we end up with it active/
+			elif self.branch not in remote_branches:
+				if self.create_branches:
+					await self._create_branches()
+					init_branches = [self.branch]
 				else:
-					init_branches.remove(self.branch)
-					init_branches += [self.branch]
+					raise ShellError(f"Could not find remote branch: {self.branch} in git tree {self.root}.")
+			else:
+				# Create local tracking branches for all other remote branches with a single shell, rather than checking
+				# out, cleaning and pulling each one in turn. Only the branch we want gets checked out, below.
+				missing = [b for b in remote_branches if b != self.branch and not self.local_branch_exists(b)]
+				if missing:
+					cmds = [f"git branch --track {b} origin/{b}" for b in missing]
+					await self.run_shell(f"( cd {self.root} && " + " && ".join(cmds) + " )")
+				init_branches.append(self.branch)
 		else:
 			if self.branch is not None:
 				init_branches.append(self.branch)
@@ -350,7 +519,7 @@ class GitTree(Tree):
 
 		# if we've gotten here, we can assume that the repo exists at self.root.
 		if self.url is not None and self.origin_check:
-			proc, out = await capture_bg("(cd %s && git remote get-url origin)" % self.root)
+			proc, out = await capture_exec(["git", "remote", "get-url", "origin"], cwd=self.root)
 			out = out.strip()
 			my_url = self.url
 			if my_url.endswith(".git"):
@@ -376,7 +545,7 @@ class GitTree(Tree):
 		if self.keep_branch and self.branch is None and cur_branch is not None:
 			await self.git_checkout(cur_branch, from_init=True)
 		elif self.commit_sha1:
-			await self.run_shell("(cd %s && git checkout %s )" % (self.root, self.commit_sha1))
+			await self.run_git("checkout", self.commit_sha1)
 			if self.head() != self.commit_sha1:
 				raise GitTreeError("%s: Was not able to check out specified SHA1: %s." % (self.root, self.commit_sha1))
 		else:
@@ -385,42 +554,62 @@ class GitTree(Tree):
 			await self.do_pull()
 		self.initialized = True
 
-	async def do_pull(self):
+	async def fetch(self, force=False):
+		"""
+		Run ``git fetch`` in this tree, unless we already did so within the last ``fetch_ttl`` seconds.
+		"""
+		if not force and time.monotonic() - GitTree.last_fetch.get(self.root, float("-inf")) < self.fetch_ttl:
+			self.log.debug(f"Skipping git fetch of {self.root}, fetched recently.")
+			return
+		await self.run_git("fetch", "--verbose")
+		GitTree.last_fetch[self.root] = time.monotonic()
+
+	async def _fast_sync(self, checkout_args, fetched=True):
+		"""
+		Check out a branch (``checkout_args`` are passed to ``git checkout``) and clean the tree in a single shell
+		invocation, then bring it up to date. When ``fetched`` is True, we've just run ``git fetch``, so ``do_pull()``
+		fast-forwards from the already-fetched upstream instead of fetching all over again.
+		"""
+		cmds = ["git checkout " + " ".join(checkout_args), "git reset --hard", "git clean -fdx"]
+		await self.run_shell(f"( cd {self.root} && " + " && ".join(cmds) + " )")
+		self.autogenned = False
+		await self.do_pull(fetched=fetched)
+
+	async def do_pull(self, fetched=False):
 		if self.pull and not self.pulled:
 			# we are on the right branch, but we want to make sure we have the latest updates
 			try:
-				await self.run_shell("(cd %s && git pull --ff-only)" % self.root)
+				if fetched:
+					await self.run_git("merge", "--ff-only", "@{upstream}")
+				else:
+					await self.run_git("pull", "--ff-only")
 				self.pulled = True
 			except ShellError as se:
 				self.log.error(f"git pull of {self.name} failed -- do you want to force pull? (Type \"yes\"): ")
 				self.log.error("DON'T DO THIS UNLESS YOU HAVE INVESTIGATED THE TREE AND KNOW EXACTLY WHAT YOU ARE DOING!")
 				yesno = input(" force pull? > ")
 				if yesno == "yes":
-					await self.run_shell("(cd %s && git pull --force)" % self.root)
+					await self.run_git("pull", "--force")
 					self.pulled = True
 				else:
 					raise se
 
 	def get_remote_url(self, remote):
-		s, o = subprocess.getstatusoutput("( cd %s && git remote get-url %s )" % (self.root, remote))
+		s, o = git_query(self.root, "remote", "get-url", remote)
 		if s:
 			return None
 		else:
-			return o.strip()
+			return o
 
 	def set_remote_url(self, mirror_name, url):
-		s, o = subprocess.getstatusoutput("( cd %s && git remote add %s %s )" % (self.root, mirror_name, url))
+		s, o = git_query(self.root, "remote", "add", mirror_name, url)
 		if s:
 			return False
 		else:
 			return True
 
 	def remote_branch_exists(self, branch):
-		s, o = subprocess.getstatusoutput("( cd %s && git show-branch remotes/origin/%s )" % (self.root, branch))
-		if s:
-			return False
-		else:
-			return True
+		return self.resolve_ref(f"refs/remotes/origin/{branch}") is not None
 
 	def get_all_cat_pkgs(self):
 		cats = set()
@@ -429,23 +618,24 @@ class GitTree(Tree):
 				cats = set(a.read().split())
 		except FileNotFoundError:
 			pass
-		for item in glob.glob(self.root + "/*-*"):
-			if os.path.isdir(item):
-				cat = os.path.basename(item)
-				if cat not in cats:
-					print("!!! WARNING: category %s not in categories... should be added to profiles/categories!" % item)
-				cats.add(cat)
+		with os.scandir(self.root) as entries:
+			for entry in entries:
+				if "-" not in entry.name or entry.name.startswith(".") or not entry.is_dir():
+					continue
+				if entry.name not in cats:
+					print("!!! WARNING: category %s not in categories... should be added to profiles/categories!" % entry.path)
+				cats.add(entry.name)
 		cats = sorted(list(cats))
 		catpkgs = {}
 
 		for cat in cats:
-			if not os.path.exists(self.root + "/" + cat):
+			try:
+				with os.scandir(self.root + "/" + cat) as entries:
+					for entry in entries:
+						if entry.is_dir():
+							catpkgs[cat + "/" + entry.name] = self.name
+			except (FileNotFoundError, NotADirectoryError):
 				continue
-			pkgs = os.listdir(self.root + "/" + cat)
-			for pkg in pkgs:
-				if not os.path.isdir(self.root + "/" + cat + "/" + pkg):
-					continue
-				catpkgs[cat + "/" + pkg] = self.name
 		return catpkgs
 
 	def catpkg_exists(self, catpkg):
@@ -463,28 +653,39 @@ class GitTree(Tree):
 		if not from_init:
 			await self.initialize()
 		if sha1 is not None and self.head() != sha1:
-			await self.run_shell("(cd %s && git fetch --verbose && git checkout %s)" % (self.root, sha1))
+			# The fetch TTL only helps if we already have the commit -- if we don't, we must hit the network:
+			if self.resolve_ref(f"{sha1}^{{commit}}") is not None:
+				await self.fetch()
+			else:
+				await self.fetch(force=True)
+			await self.run_git("checkout", sha1)
 			await self.clean_tree()
 			if self.head() != sha1:
 				raise GitTreeError("Not able to check out requested sha1: %s, got: %s" % (sha1, self.head()))
 		else:
 			if self.current_local_branch != branch:
-				await self.run_shell("(cd %s && git fetch --verbose)" % self.root)
+				await self.fetch()
+				if not self.local_branch_exists(branch) and not self.remote_branch_exists(branch):
+					# Before concluding the branch doesn't exist (and possibly creating it), make sure it wasn't just
+					# created upstream since our last fetch:
+					await self.fetch(force=True)
 				if self.local_branch_exists(branch):
-					await self.run_shell("(cd %s && git checkout %s)" % (self.root, branch))
-					await self.clean_tree()
-					await self.do_pull()
+					await self._fast_sync([branch])
 				elif self.remote_branch_exists(branch):
 					# An AutoCreatedGitTree will automatically create branches as needed, as forks of master.
-					await self.run_shell("(cd %s && git checkout -b %s --track origin/%s)" % (self.root, branch, branch))
-					await self.clean_tree()
-					await self.do_pull()
+					await self._fast_sync(["-b", branch, "--track", f"origin/{branch}"])
 				elif self.create_branches:
-					await self.run_shell(f"(cd {self.root} && git checkout -b {branch})")
-					await self.run_shell(f"echo 'created by merge-kits.' > {self.root}/README")
-					await self.run_shell(f"(cd {self.root} && git add README; git commit -a -m 'initial commit by merge-kits' )")
-					await self.run_shell(f"(cd {self.root} && git push --set-upstream origin {branch})")
-					await self.clean_tree()
+					cmds = [
+						f"git checkout -b {branch}",
+						"echo 'created by merge-kits.' > README",
+						"git add README",
+						"git commit -a -m 'initial commit by merge-kits'",
+						f"git push --set-upstream origin {branch}",
+						"git reset --hard",
+						"git clean -fdx",
+					]
+					await self.run_shell(f"( cd {self.root} && " + " && ".join(cmds) + " )")
+					self.autogenned = False
 			else:
 				old_head = self.head()
 				await self.do_pull()
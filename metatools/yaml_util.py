@@ -1,8 +1,86 @@
 #!/usr/bin/env python3
 
+import hashlib
 import io
+import os
+import pickle
+
 import yaml
 
+try:
+	from yaml import CSafeLoader as SafeLoader
+except ImportError:
+	from yaml import SafeLoader
+
+
+def safe_load(stream):
+	"""
+	Drop-in replacement for ``yaml.safe_load()`` which uses the libyaml-based ``CSafeLoader`` when PyYAML has been
+	built with it, falling back to the pure-Python ``SafeLoader`` otherwise.
+	"""
+	return yaml.load(stream, Loader=SafeLoader)
+
+
+# In-process layer on top of the on-disk cache used by load_yaml_cached(), mapping (path, parser) to the
+# (path, mtime, size) key the data was parsed for, and the parsed data:
+YAML_CACHE = {}
+
+
+def load_yaml_cached(path, cache_dir=None, parser=safe_load):
+	"""
+	Parse the YAML file at ``path`` (using ``parser``, which is passed the file's contents as ``bytes``) and cache the
+	result as a pickle in ``cache_dir``. The cache entry is keyed on the file's path, mtime and size, so when the file is
+	unchanged we can skip parsing entirely, and when it changes the cache entry is transparently replaced. The cache is
+	only readable by the current user. If ``cache_dir`` is None, the result is only cached in memory -- use this for
+	files containing anything sensitive, such as credentials, which shouldn't be copied anywhere else on disk.
+
+	Parsed data is also kept in memory, so loading the same unchanged file again in this process (for example, a
+	``packages.yaml`` shared by several kits) is just a ``stat()`` and a dict lookup. As a result, callers share the
+	returned data and must not modify it.
+
+	Raises ``FileNotFoundError`` if ``path`` doesn't exist. Failure to read or write the cache is not an error -- we
+	just parse the file.
+	"""
+	path = os.path.abspath(path)
+	st = os.stat(path)
+	key = (path, st.st_mtime_ns, st.st_size)
+	cached = YAML_CACHE.get((path, parser))
+	if cached is not None and cached[0] == key:
+		return cached[1]
+	data = _load_yaml_cached(path, key, cache_dir, parser)
+	YAML_CACHE[(path, parser)] = (key, data)
+	return data
+
+
+def _load_yaml_cached(path, key, cache_dir, parser):
+	if cache_dir is not None:
+		cache_path = os.path.join(cache_dir, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pickle")
+		try:
+			with open(cache_path, "rb") as f:
+				cached_key, data = pickle.load(f)
+			if cached_key == key:
+				return data
+		except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+			pass
+	# Hand the parser the whole file as a single buffer -- libyaml can then scan it directly, rather than PyYAML reading
+	# and decoding the file a chunk at a time:
+	with open(path, "rb") as f:
+		data = parser(f.read())
+	if cache_dir is None:
+		return data
+	try:
+		# The cache holds copies of whatever we parse, so keep it private, regardless of umask. makedirs() won't change
+		# the mode of a directory that already exists, so set it explicitly:
+		os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+		os.chmod(cache_dir, 0o700)
+		tmp_path = f"{cache_path}.{os.getpid()}"
+		with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+			pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tmp_path, cache_path)
+	except OSError:
+		pass
+	return data
+
 
 class YAMLReader:
 
@@ -12,8 +90,16 @@ class YAMLReader:
 		"""
 		pass
 
-	def __init__(self, stream):
-		self.yaml = yaml.safe_load(stream)
+	def __init__(self, stream=None, data=None):
+		"""
+		Read YAML from ``stream`` (``bytes``, ``str`` or a file object), or use ``data`` if it has already been parsed
+		(for example, by ``load_yaml_cached()``.)
+		"""
+		if data is None:
+			if hasattr(stream, "read"):
+				stream = stream.read()
+			data = safe_load(stream)
+		self.yaml = data
 		self.start()
 
 	def get_elem(self, el_path):